@@ -0,0 +1,74 @@
+"""
+Per-batch stage checkpoints for run_daily.
+
+Each pipeline stage writes a versioned JSON artifact under
+STATE_DIR/checkpoints/<batch_date>/<stage>.json once it completes, so a
+--resume run can pick up after the last completed stage instead of
+re-running arXiv ingestion and LLM generation.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Any
+
+from automation.state import STATE_DIR
+
+# Bump when the shape of any stage payload changes; older artifacts are ignored.
+CHECKPOINT_VERSION = 1
+
+STAGES = ("ingest", "generate", "categorize", "persist")
+
+
+class CheckpointStore:
+    """Checkpoint artifacts for one batch date."""
+
+    def __init__(self, batch_date: str, directory: str | None = None):
+        self.batch_date = batch_date
+        self.directory = os.path.join(directory or os.path.join(STATE_DIR, "checkpoints"), batch_date)
+
+    def _path(self, stage: str) -> str:
+        return os.path.join(self.directory, f"{stage}.json")
+
+    def save(self, stage: str, data: Any) -> None:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        os.makedirs(self.directory, exist_ok=True)
+        artifact = {
+            "version": CHECKPOINT_VERSION,
+            "stage": stage,
+            "batch_date": self.batch_date,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "data": data,
+        }
+        path = self._path(stage)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(artifact, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+        print(f"  [checkpoint] Saved {stage} for {self.batch_date}")
+
+    def load(self, stage: str) -> Any | None:
+        """Return the stage payload, or None if missing, unreadable or stale."""
+        try:
+            with open(self._path(stage), encoding="utf-8") as f:
+                artifact = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if artifact.get("version") != CHECKPOINT_VERSION:
+            return None
+        return artifact.get("data")
+
+    def last_completed(self) -> str | None:
+        """The furthest stage whose checkpoint (and all before it) is usable."""
+        last = None
+        for stage in STAGES:
+            if self.load(stage) is None:
+                break
+            last = stage
+        return last
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,248 @@
+"""
+Near-duplicate detection for ideas across batches.
+
+A local MinHash/LSH index over every persisted idea (character shingles of
+startup name + value proposition) and the set of arXiv ids that already
+produced an idea. Both live in the state SQLite database next to the
+ingest index and are updated incrementally after each persisted batch;
+an empty index is bootstrapped once from Supabase.
+
+Before generation, papers that already have an idea are filtered out.
+After generation, ideas whose text is a near-duplicate of an earlier idea
+(estimated Jaccard >= DUPLICATE_THRESHOLD) are flagged with
+"_duplicate_of".
+
+NUM_PERM, BANDS and _SEED are part of the stored format; changing them
+requires deleting the idea_signatures/idea_lsh tables.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import uuid
+import zlib
+from typing import Any, Iterable
+
+import numpy as np
+
+from automation.state import STATE_DIR, base_arxiv_id
+
+NUM_PERM = 64
+BANDS = 16  # 4 rows per band: candidate pairs from ~0.5 Jaccard upwards
+DUPLICATE_THRESHOLD = 0.6
+SHINGLE_SIZE = 5
+
+_SEED = 20260101
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(_SEED)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+IDEA_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://mvpxiv.dev/ideas")
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def _normalize(text: str) -> str:
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def signature(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint64 values) of text's character shingles."""
+    text = _normalize(text)
+    shingles = {text[i : i + SHINGLE_SIZE] for i in range(max(1, len(text) - SHINGLE_SIZE + 1))}
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode()) % _PRIME for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    return ((np.outer(hashes, _A) + _B) % _PRIME).min(axis=0)
+
+
+def _bands(sig: np.ndarray) -> list[int]:
+    rows = NUM_PERM // BANDS
+    return [
+        int.from_bytes(
+            hashlib.blake2b(sig[b * rows : (b + 1) * rows].tobytes(), digest_size=8).digest(),
+            "big",
+            signed=True,
+        )
+        for b in range(BANDS)
+    ]
+
+
+def idea_text(name: str, value_proposition: str) -> str:
+    return f"{name} {value_proposition}"
+
+
+def stable_idea_id(batch_date: str, idea: dict[str, Any]) -> str:
+    """Deterministic idea id: same batch + same paper → same id on re-runs."""
+    paper = idea.get("paper") or {}
+    key = base_arxiv_id(paper.get("arxivId") or "") or paper.get("url") or idea.get("startupName", "")
+    return str(uuid.uuid5(IDEA_NAMESPACE, f"{batch_date}:{key}"))
+
+
+class IdeaIndex:
+    """SQLite-backed MinHash/LSH index of persisted ideas and their papers."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(STATE_DIR, "state.sqlite")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(
+            """
+            create table if not exists idea_signatures (
+              idea_id      text primary key,
+              batch_date   text not null,
+              arxiv_id     text,
+              startup_name text not null,
+              signature    blob not null
+            );
+            create index if not exists idx_idea_signatures_batch on idea_signatures(batch_date);
+            create index if not exists idx_idea_signatures_arxiv on idea_signatures(arxiv_id);
+            create table if not exists idea_lsh (
+              band    integer not null,
+              bucket  integer not null,
+              idea_id text not null,
+              primary key (band, bucket, idea_id)
+            ) without rowid;
+            """
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("select count(*) from idea_signatures").fetchone()[0]
+
+    def used_paper_ids(self, exclude_batch: str | None = None) -> set[str]:
+        """Base arXiv ids that already produced an idea (outside exclude_batch)."""
+        rows = self._conn.execute(
+            "select distinct arxiv_id from idea_signatures where arxiv_id is not null and batch_date != ?",
+            (exclude_batch or "",),
+        )
+        return {r[0] for r in rows}
+
+    def find_duplicates(
+        self,
+        text: str,
+        exclude_batch: str | None = None,
+        threshold: float = DUPLICATE_THRESHOLD,
+    ) -> list[tuple[str, str, str, float]]:
+        """(idea_id, batch_date, startup_name, similarity) of near-duplicates, best first."""
+        sig = signature(text)
+        candidates: set[str] = set()
+        for band, bucket in enumerate(_bands(sig)):
+            rows = self._conn.execute(
+                "select idea_id from idea_lsh where band = ? and bucket = ?", (band, bucket)
+            )
+            candidates.update(r[0] for r in rows)
+        matches: list[tuple[str, str, str, float]] = []
+        for idea_id in candidates:
+            row = self._conn.execute(
+                "select batch_date, startup_name, signature from idea_signatures where idea_id = ?",
+                (idea_id,),
+            ).fetchone()
+            if row is None or row[0] == exclude_batch:
+                continue
+            stored = np.frombuffer(row[2], dtype=np.uint64)
+            if stored.shape != sig.shape:
+                continue
+            similarity = float(np.mean(stored == sig))
+            if similarity >= threshold:
+                matches.append((idea_id, row[0], row[1], similarity))
+        return sorted(matches, key=lambda m: m[3], reverse=True)
+
+    def add(self, rows: Iterable[dict[str, Any]]) -> int:
+        """
+        Index persisted idea rows (Supabase column names). Re-adding an id
+        replaces its entry. Returns the number of rows indexed.
+        """
+        count = 0
+        with self._conn:
+            for row in rows:
+                sig = signature(idea_text(row["startup_name"], row.get("value_proposition") or ""))
+                arxiv_id = base_arxiv_id(row.get("paper_arxiv_id") or "") or None
+                self._conn.execute("delete from idea_lsh where idea_id = ?", (row["id"],))
+                self._conn.execute(
+                    "insert or replace into idea_signatures values (?, ?, ?, ?, ?)",
+                    (row["id"], row["batch_date"], arxiv_id, row["startup_name"], sig.tobytes()),
+                )
+                self._conn.executemany(
+                    "insert or ignore into idea_lsh values (?, ?, ?)",
+                    [(band, bucket, row["id"]) for band, bucket in enumerate(_bands(sig))],
+                )
+                count += 1
+        return count
+
+    def remove_batch(self, batch_date: str) -> None:
+        with self._conn:
+            self._conn.execute(
+                "delete from idea_lsh where idea_id in (select idea_id from idea_signatures where batch_date = ?)",
+                (batch_date,),
+            )
+            self._conn.execute("delete from idea_signatures where batch_date = ?", (batch_date,))
+
+    def bootstrap(self, client, page_size: int = 1000) -> int:
+        """Fill an empty index from every idea already in Supabase."""
+        total = 0
+        start = 0
+        while True:
+            rows = (
+                client.table("ideas")
+                .select("id,batch_date,startup_name,value_proposition,paper_arxiv_id")
+                .order("created_at")
+                .range(start, start + page_size - 1)
+                .execute()
+                .data
+            ) or []
+            total += self.add(rows)
+            if len(rows) < page_size:
+                return total
+            start += page_size
+
+
+def filter_papers(papers: list, index: IdeaIndex, exclude_batch: str | None = None) -> list:
+    """Drop ArxivPapers that already produced an idea in an earlier batch."""
+    used = index.used_paper_ids(exclude_batch)
+    kept = [p for p in papers if base_arxiv_id(p.arxiv_id) not in used]
+    if len(kept) < len(papers):
+        print(f"  [dedup] Skipped {len(papers) - len(kept)} papers that already have an idea")
+    return kept
+
+
+def flag_duplicates(ideas: list[dict[str, Any]], index: IdeaIndex, exclude_batch: str | None = None) -> int:
+    """
+    Mark ideas that repeat an earlier paper or near-duplicate an earlier
+    idea with "_duplicate_of". Returns the number flagged.
+    """
+    used = index.used_paper_ids(exclude_batch)
+    seen_in_batch: set[str] = set()
+    flagged = 0
+    for idea in ideas:
+        paper_id = base_arxiv_id((idea.get("paper") or {}).get("arxivId") or "")
+        reason = None
+        if paper_id and (paper_id in used or paper_id in seen_in_batch):
+            reason = {"paper": paper_id}
+            print(f"  [dedup] {idea.get('startupName')!r} reuses paper {paper_id}")
+        else:
+            matches = index.find_duplicates(
+                idea_text(idea.get("startupName", ""), idea.get("valueProposition", "")),
+                exclude_batch,
+            )
+            if matches:
+                idea_id, batch_date, name, similarity = matches[0]
+                reason = {"idea": idea_id, "batch": batch_date, "similarity": round(similarity, 2)}
+                print(
+                    f"  [dedup] {idea.get('startupName')!r} ≈ {name!r} from {batch_date} "
+                    f"(similarity {similarity:.2f})"
+                )
+        if paper_id:
+            seen_in_batch.add(paper_id)
+        if reason:
+            idea["_duplicate_of"] = reason
+            flagged += 1
+    if flagged:
+        print(f"  [dedup] Flagged {flagged}/{len(ideas)} ideas as duplicates")
+    return flagged
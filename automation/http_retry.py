@@ -0,0 +1,28 @@
+"""
+HTTP retry helpers shared by the pipeline's API clients (OpenRouter,
+arXiv OAI-PMH).
+"""
+
+from __future__ import annotations
+
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+
+def retry_after(resp: httpx.Response | None) -> float | None:
+    """Seconds a Retry-After header asks for (delta-seconds or HTTP-date), or None."""
+    if resp is None:
+        return None
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
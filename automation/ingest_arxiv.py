@@ -2,10 +2,19 @@
 
 from __future__ import annotations
 
+import threading
 import time
 import arxiv
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+from automation.state import IngestIndex, base_arxiv_id
+
+DEFAULT_CATEGORIES = ["cs.LG", "cs.MA", "cs.AI", "cs.CL"]
+
+# arXiv API terms of use: no more than 1 request every 3 seconds.
+ARXIV_REQUEST_INTERVAL = 3.0
+
 
 @dataclass
 class ArxivPaper:
@@ -16,63 +25,168 @@ class ArxivPaper:
     arxiv_id: str
     published_at: str
     primary_category: str
+    query_category: str = ""
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket. One instance is shared by every category
+    worker so the process as a whole honors arXiv's request rate.
+    """
+
+    def __init__(self, interval: float = ARXIV_REQUEST_INTERVAL, burst: int = 1):
+        self.interval = interval
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) / self.interval,
+                )
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) * self.interval
+            time.sleep(wait)
+
+
+class _RateLimitedClient(arxiv.Client):
+    """arxiv.Client that takes a token from a shared limiter before every page request (retries included)."""
+
+    def __init__(self, limiter: RateLimiter, **kwargs):
+        super().__init__(delay_seconds=0.0, **kwargs)
+        self._limiter = limiter
+
+    def _parse_feed(self, url, first_page=True, _try_index=0):
+        self._limiter.acquire()
+        return super()._parse_feed(url, first_page=first_page, _try_index=_try_index)
+
+
+def _to_paper(result: arxiv.Result, query_category: str = "") -> ArxivPaper:
+    return ArxivPaper(
+        title=result.title.strip().replace("\n", " "),
+        url=result.entry_id,
+        authors=[a.name for a in result.authors],
+        abstract=result.summary.strip().replace("\n", " "),
+        arxiv_id=result.entry_id.split("/abs/")[-1],
+        published_at=result.published.strftime("%Y-%m-%d"),
+        primary_category=result.primary_category,
+        query_category=query_category,
+    )
+
+
+def _fetch_category(
+    cat: str,
+    max_per_category: int,
+    limiter: RateLimiter,
+    seen: set[str] | None = None,
+    watermark: str | None = None,
+) -> tuple[list[ArxivPaper], float]:
+    """
+    Fetch one category. Returns (papers, elapsed seconds).
+
+    Results arrive newest-first, so iteration (and with it pagination)
+    stops at the first already-processed paper or the first paper
+    submitted before the category watermark.
+    """
+    started = time.monotonic()
+    print(f"  [ingest] Querying {cat} (max {max_per_category})...")
+    search = arxiv.Search(
+        query=f"cat:{cat}",
+        max_results=max_per_category,
+        sort_by=arxiv.SortCriterion.SubmittedDate,
+        sort_order=arxiv.SortOrder.Descending,
+    )
+    client = _RateLimitedClient(
+        limiter,
+        page_size=max_per_category,
+        num_retries=5,
+    )
+
+    papers: list[ArxivPaper] = []
+    try:
+        for result in client.results(search):
+            paper = _to_paper(result, cat)
+            if seen and base_arxiv_id(paper.arxiv_id) in seen:
+                print(f"  [ingest] {cat}: reached already-processed {paper.arxiv_id}, stopping")
+                break
+            if watermark and paper.published_at < watermark:
+                print(f"  [ingest] {cat}: reached watermark {watermark}, stopping")
+                break
+            papers.append(paper)
+    except Exception as e:
+        print(f"  [ingest] Error fetching {cat}: {e}")
+        print(f"  [ingest] Continuing with papers fetched so far...")
+
+    return papers, time.monotonic() - started
 
 
 def fetch_recent_papers(
     categories: list[str] | None = None,
     max_per_category: int = 25,
+    max_workers: int | None = None,
+    index: IngestIndex | None = None,
+    batch_date: str | None = None,
 ) -> list[ArxivPaper]:
     """
     Fetch newest papers from arXiv for the given categories.
     Uses the arxiv Python package (no HTML scraping).
-    Adds inter-category delay to avoid 429 rate limits.
+
+    All categories are queried in flight at once (max_workers=1 walks
+    them one at a time); a single shared RateLimiter keeps the combined
+    request rate within arXiv's limit. Results are merged in category
+    order, so cross-category dedup is deterministic.
+
+    With an IngestIndex, only papers not yet processed by an earlier batch
+    are returned (papers processed for batch_date itself are kept, so a
+    re-run of the same date sees the same input).
     """
     if categories is None:
-        categories = ["cs.LG", "cs.MA", "cs.AI", "cs.CL"]
+        categories = DEFAULT_CATEGORIES
+
+    seen: set[str] = set()
+    watermarks: dict[str, str] = {}
+    if index is not None:
+        seen = index.seen_ids(exclude_batch=batch_date)
+        watermarks = index.watermarks(exclude_batch=batch_date)
+        print(f"  [ingest] Incremental: {len(seen)} processed ids, watermarks {watermarks}")
+
+    limiter = RateLimiter()
+    workers = max_workers or len(categories) or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _fetch_category,
+                cat,
+                max_per_category,
+                limiter,
+                seen,
+                watermarks.get(cat),
+            )
+            for cat in categories
+        ]
+        results = [f.result() for f in futures]
 
     all_papers: list[ArxivPaper] = []
     seen_ids: set[str] = set()
 
-    for idx, cat in enumerate(categories):
-        if idx > 0:
-            print(f"  [ingest] Waiting 10s before next category to avoid rate limit...")
-            time.sleep(10)
-
-        print(f"  [ingest] Querying {cat} (max {max_per_category})...")
-        query = f"cat:{cat}"
-        search = arxiv.Search(
-            query=query,
-            max_results=max_per_category,
-            sort_by=arxiv.SortCriterion.SubmittedDate,
-            sort_order=arxiv.SortOrder.Descending,
-        )
-
-        client = arxiv.Client(
-            page_size=max_per_category,
-            delay_seconds=5.0,
-            num_retries=5,
-        )
-
-        try:
-            for result in client.results(search):
-                aid = result.entry_id.split("/abs/")[-1]
-                if aid in seen_ids:
-                    continue
-                seen_ids.add(aid)
-
-                paper = ArxivPaper(
-                    title=result.title.strip().replace("\n", " "),
-                    url=result.entry_id,
-                    authors=[a.name for a in result.authors],
-                    abstract=result.summary.strip().replace("\n", " "),
-                    arxiv_id=aid,
-                    published_at=result.published.strftime("%Y-%m-%d"),
-                    primary_category=result.primary_category,
-                )
-                all_papers.append(paper)
-        except Exception as e:
-            print(f"  [ingest] Error fetching {cat}: {e}")
-            print(f"  [ingest] Continuing with papers fetched so far...")
+    for cat, (papers, elapsed) in zip(categories, results):
+        added = 0
+        for paper in papers:
+            if paper.arxiv_id in seen_ids:
+                continue
+            seen_ids.add(paper.arxiv_id)
+            all_papers.append(paper)
+            added += 1
+        print(f"  [ingest] {cat}: {len(papers)} fetched, {added} new in {elapsed:.1f}s")
 
     print(f"[ingest] Fetched {len(all_papers)} papers across {categories}")
     return all_papers
@@ -0,0 +1,140 @@
+"""
+Deterministic local repair for almost-JSON LLM output.
+
+Runs before any network repair round trip. Handles the failure modes we
+actually see from the models:
+  - prose or fences before/after the JSON document
+  - trailing commas before } or ]
+  - missing commas between adjacent values
+  - smart quotes used as string delimiters
+  - raw newlines/tabs inside strings
+  - output cut off at max_tokens (unterminated strings, open arrays/objects):
+    the partial element of the outermost open array is dropped and every
+    open container is closed
+"""
+
+from __future__ import annotations
+
+import json
+
+_OPEN_SMART = "“„"  # “ „
+_CLOSE_SMART = "”“"  # ” “
+_CLOSERS = {"{": "}", "[": "]"}
+_VALUE_END = set('"}]') | set("0123456789") | set("el")  # true/false/null end in e/l
+
+
+def _strip_noise(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        newline = text.find("\n")
+        text = text[newline + 1 :] if newline != -1 else ""
+    if text.rstrip().endswith("```"):
+        text = text[: text.rstrip().rfind("```")]
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    return text[min(starts) :] if starts else ""
+
+
+def _last_significant(out: list[str]) -> str:
+    for ch in reversed(out):
+        if not ch.isspace():
+            return ch
+    return ""
+
+
+def _drop_trailing_comma(out: list[str]) -> None:
+    i = len(out) - 1
+    while i >= 0 and out[i].isspace():
+        i -= 1
+    if i >= 0 and out[i] == ",":
+        del out[i:]
+
+
+def repair_json(raw: str) -> str | None:
+    """
+    Return a repaired JSON string that json.loads accepts, or None if the
+    input is beyond local repair.
+    """
+    text = _strip_noise(raw)
+    if not text:
+        return None
+
+    out: list[str] = []
+    stack: list[str] = []
+    # Per nesting depth: the latest (output length, stack) at which the
+    # document can be cut and closed, i.e. just after a complete element.
+    safe: dict[int, tuple[int, list[str]]] = {}
+    in_string = False
+    smart = False  # current string was opened with a smart quote
+    escape = False
+    complete = False
+
+    for ch in text:
+        if in_string:
+            if escape:
+                out.append(ch)
+                escape = False
+            elif ch == "\\":
+                out.append(ch)
+                escape = True
+            elif (smart and ch in _CLOSE_SMART) or (not smart and ch == '"'):
+                out.append('"')
+                in_string = False
+            elif smart and ch == '"':
+                out.append('\\"')
+            elif ch == "\n":
+                out.append("\\n")
+            elif ch == "\r":
+                out.append("\\r")
+            elif ch == "\t":
+                out.append("\\t")
+            else:
+                out.append(ch)
+            continue
+
+        if ch == '"' or ch in _OPEN_SMART:
+            if _last_significant(out) in _VALUE_END:
+                out.append(",")
+            out.append('"')
+            in_string = True
+            smart = ch != '"'
+        elif ch in "{[":
+            if _last_significant(out) in _VALUE_END:
+                out.append(",")
+            out.append(ch)
+            stack.append(ch)
+            safe[len(stack)] = (len(out), list(stack))
+        elif ch in "}]":
+            if not stack or _CLOSERS[stack[-1]] != ch:
+                break
+            _drop_trailing_comma(out)
+            out.append(ch)
+            stack.pop()
+            if not stack:
+                complete = True
+                break
+            safe[len(stack)] = (len(out), list(stack))
+        elif ch == ",":
+            _drop_trailing_comma(out)
+            safe[len(stack)] = (len(out), list(stack))
+            out.append(ch)
+        else:
+            out.append(ch)
+
+    if not complete:
+        # Cut back to the outermost open array so a half-written element
+        # (e.g. the last idea) is dropped whole rather than left partial.
+        arrays = [depth for depth, c in enumerate(stack, 1) if c == "[" and depth in safe]
+        depth = arrays[0] if arrays else max(safe, default=None)
+        if depth is None:
+            return None
+        cut, open_stack = safe[depth]
+        del out[cut:]
+        _drop_trailing_comma(out)
+        out.extend(_CLOSERS[c] for c in reversed(open_stack))
+
+    repaired = "".join(out)
+    try:
+        json.loads(repaired, strict=False)
+    except json.JSONDecodeError:
+        return None
+    return repaired
@@ -0,0 +1,127 @@
+"""
+Incremental validation of a streamed blueprint response.
+
+IdeaStreamParser is fed the completion text as it arrives and tracks
+just enough JSON structure (nesting depth, strings, the current top-level
+key) to cut out each element of the top-level "ideas" array the moment
+its closing brace arrives. Every idea is validated immediately, so a
+response that is clearly going wrong can be abandoned early and the next
+model started, instead of paying for the full generation first. Up to
+max_invalid bad ideas are tolerated (and skipped) because the pipeline
+can regenerate individual slots afterwards.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+
+class StreamAborted(Exception):
+    """The streamed response is not worth finishing."""
+
+
+class IdeaStreamParser:
+    def __init__(
+        self,
+        validate_idea: Callable[[Any], bool],
+        max_ideas: int = 10,
+        max_preamble_chars: int = 2000,
+        max_idea_chars: int = 16000,
+        max_invalid: int = 0,
+    ):
+        self.validate_idea = validate_idea
+        self.max_ideas = max_ideas
+        self.max_preamble_chars = max_preamble_chars
+        self.max_idea_chars = max_idea_chars
+        self.max_invalid = max_invalid
+
+        self.ideas: list[dict[str, Any]] = []
+        self.invalid = 0
+        self.done = False  # top-level object closed; the rest can be dropped
+        self._buf: list[str] = []
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = ""
+        self._ideas_depth: int | None = None
+        self._idea_start: int | None = None
+
+    def feed(self, text: str) -> list[dict[str, Any]]:
+        """Consume a chunk. Returns ideas completed in it; raises StreamAborted."""
+        completed: list[dict[str, Any]] = []
+        if self.done:
+            return completed
+        self._buf.append(text)
+        for ch in text:
+            pos = self._pos
+            self._pos += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = self._slice(self._string_start, pos)
+                continue
+
+            if self._depth == 0:
+                # Preamble (prose, fences) until the top-level object opens.
+                if ch == "{":
+                    self._depth = 1
+                elif pos >= self.max_preamble_chars:
+                    raise StreamAborted(f"no JSON object after {pos} chars")
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = pos + 1
+            elif ch in "{[":
+                self._depth += 1
+                if ch == "[" and self._depth == 2 and self._last_string == "ideas":
+                    self._ideas_depth = 2
+                elif ch == "{" and self._ideas_depth == 2 and self._depth == 3:
+                    self._idea_start = pos
+            elif ch in "}]":
+                self._depth -= 1
+                if ch == "}" and self._idea_start is not None and self._depth == 2:
+                    idea = self._close_idea(pos)
+                    if idea is not None:
+                        completed.append(idea)
+                elif ch == "]" and self._depth == 1 and self._ideas_depth == 2:
+                    self._ideas_depth = None
+                elif self._depth == 0:
+                    self.done = True
+                    break
+
+            if self._idea_start is not None and pos - self._idea_start > self.max_idea_chars:
+                raise StreamAborted(f"idea {len(self.ideas) + 1} exceeds {self.max_idea_chars} chars")
+        return completed
+
+    def _slice(self, start: int, end: int) -> str:
+        text = "".join(self._buf)
+        self._buf = [text]
+        return text[start:end]
+
+    def _close_idea(self, end: int) -> dict[str, Any] | None:
+        raw = self._slice(self._idea_start, end + 1)
+        self._idea_start = None
+        number = len(self.ideas) + self.invalid + 1
+        try:
+            idea = json.loads(raw, strict=False)
+        except json.JSONDecodeError as e:
+            return self._reject(f"idea {number} is not valid JSON: {e}")
+        if not self.validate_idea(idea):
+            return self._reject(f"idea {number} failed schema validation")
+        self.ideas.append(idea)
+        if len(self.ideas) > self.max_ideas:
+            raise StreamAborted(f"more than {self.max_ideas} ideas")
+        return idea
+
+    def _reject(self, reason: str) -> None:
+        self.invalid += 1
+        if self.invalid > self.max_invalid:
+            raise StreamAborted(reason)
+        print(f"  [llm] {reason}; will regenerate that slot")
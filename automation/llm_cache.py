@@ -0,0 +1,104 @@
+"""
+Content-addressed on-disk cache for OpenRouter completions.
+
+Keyed on model + a hash of the messages + sampling parameters, so a
+rerun that sends the exact same prompt (step-4 failure, manual dispatch
+with the same date_override) replays the stored response instead of
+paying generation latency and tokens again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from typing import Any
+
+from automation.state import STATE_DIR
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 14 * 24 * 3600
+
+
+def cache_disabled() -> bool:
+    """MVPXIV_LLM_CACHE=0/off/false bypasses the cache entirely."""
+    return os.environ.get("MVPXIV_LLM_CACHE", "1").lower() in ("0", "off", "false", "no")
+
+
+class ResponseCache:
+    """Directory of <sha256>.json entries with size and age eviction."""
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        self.directory = directory or os.path.join(STATE_DIR, "llm_cache")
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(model: str, messages: list[dict[str, str]], params: dict[str, Any]) -> str:
+        messages_hash = hashlib.sha256(
+            json.dumps(messages, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        material = json.dumps(
+            {"model": model, "messages": messages_hash, "params": params},
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age_seconds:
+                os.remove(path)
+                self.misses += 1
+                return None
+            with open(path, encoding="utf-8") as f:
+                content = json.load(f)["content"]
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return content
+
+    def put(self, key: str, content: str, meta: dict[str, Any] | None = None) -> None:
+        path = self._path(key)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"content": content, "meta": meta or {}, "stored_at": time.time()}, f)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then oldest-first until under max_bytes."""
+        now = time.time()
+        entries: list[tuple[float, int, str]] = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if now - st.st_mtime > self.max_age_seconds:
+                os.remove(path)
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
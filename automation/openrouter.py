@@ -0,0 +1,223 @@
+"""
+Pooled OpenRouter chat-completions client.
+
+One OpenRouterClient per pipeline run holds a keep-alive HTTP/2
+connection pool (sync and async), so primary, repair and screening calls
+reuse the same TLS connection. Connect/read timeouts are tunable
+separately from the overall per-call deadline, and transient failures
+(429, 5xx, transport errors) are retried with exponential backoff that
+honors Retry-After.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Any, AsyncIterator
+
+import httpx
+
+from automation.http_retry import retry_after
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+CONNECT_TIMEOUT = float(os.environ.get("MVPXIV_LLM_CONNECT_TIMEOUT", "10"))
+READ_TIMEOUT = float(os.environ.get("MVPXIV_LLM_READ_TIMEOUT", "300"))
+TOTAL_TIMEOUT = float(os.environ.get("MVPXIV_LLM_TOTAL_TIMEOUT", "300"))
+MAX_RETRIES = 3
+MAX_CONNECTIONS = 16
+
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+_BACKOFF_BASE = 1.0
+_BACKOFF_CAP = 30.0
+
+
+class OpenRouterError(Exception):
+    """Non-retryable failure, or retries/deadline exhausted."""
+
+
+def _backoff(attempt: int, resp: httpx.Response | None) -> float:
+    hinted = retry_after(resp)
+    if hinted is not None:
+        return min(hinted, _BACKOFF_CAP)
+    return min(_BACKOFF_BASE * 2**attempt, _BACKOFF_CAP) * (0.5 + random.random() / 2)
+
+
+class OpenRouterClient:
+    """Shared sync/async OpenRouter client. Use as a (async) context manager."""
+
+    def __init__(
+        self,
+        api_key: str,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        total_timeout: float = TOTAL_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+        max_connections: int = MAX_CONNECTIONS,
+    ):
+        self.total_timeout = total_timeout
+        self.max_retries = max_retries
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://mvpxiv.dev",
+            "X-Title": "MVPXiv",
+        }
+        timeout = httpx.Timeout(connect=connect_timeout, read=read_timeout, write=30.0, pool=30.0)
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=120.0,
+        )
+        self._client_kwargs = {
+            "headers": headers,
+            "timeout": timeout,
+            "limits": limits,
+            "http2": True,
+        }
+        self._sync: httpx.Client | None = None
+        self._async: httpx.AsyncClient | None = None
+
+    # ── Async ────────────────────────────────────────────
+
+    @property
+    def aclient(self) -> httpx.AsyncClient:
+        if self._async is None:
+            self._async = httpx.AsyncClient(**self._client_kwargs)
+        return self._async
+
+    async def acomplete(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """POST a chat completion and return the decoded JSON body."""
+        try:
+            return await asyncio.wait_for(self._apost(payload), self.total_timeout)
+        except asyncio.TimeoutError:
+            raise OpenRouterError(f"no response within {self.total_timeout:g}s") from None
+
+    async def _apost(self, payload: dict[str, Any]) -> dict[str, Any]:
+        for attempt in range(self.max_retries + 1):
+            resp = None
+            try:
+                resp = await self.aclient.post(OPENROUTER_URL, json=payload)
+            except httpx.TransportError as e:
+                error: Exception = e
+            else:
+                if resp.status_code not in RETRY_STATUSES:
+                    resp.raise_for_status()
+                    return resp.json()
+                error = httpx.HTTPStatusError(
+                    f"HTTP {resp.status_code}", request=resp.request, response=resp
+                )
+            if attempt == self.max_retries:
+                raise OpenRouterError(f"giving up after {attempt + 1} attempts: {error}") from error
+            wait = _backoff(attempt, resp)
+            print(f"  [openrouter] {error}; retrying in {wait:.1f}s ({attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(wait)
+        raise AssertionError("unreachable")
+
+    async def astream(
+        self,
+        payload: dict[str, Any],
+        usage: dict[str, Any] | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion (OpenRouter SSE) and yield content deltas.
+        Retries only happen before any content has been yielded; the caller
+        enforces the overall deadline. Token usage, when reported, is
+        written into `usage`.
+        """
+        payload = {**payload, "stream": True, "usage": {"include": True}}
+        started = False
+        for attempt in range(self.max_retries + 1):
+            error: Exception | None = None
+            resp = None
+            try:
+                async with self.aclient.stream("POST", OPENROUTER_URL, json=payload) as resp:
+                    if resp.status_code in RETRY_STATUSES:
+                        error = httpx.HTTPStatusError(
+                            f"HTTP {resp.status_code}", request=resp.request, response=resp
+                        )
+                    else:
+                        resp.raise_for_status()
+                        async for line in resp.aiter_lines():
+                            # Blank lines separate events; ':' lines are keep-alive comments.
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[5:].strip()
+                            if data == "[DONE]":
+                                return
+                            chunk = json.loads(data)
+                            if "error" in chunk:
+                                raise OpenRouterError(f"stream error: {chunk['error']}")
+                            if chunk.get("usage") and usage is not None:
+                                usage.update(chunk["usage"])
+                            for choice in chunk.get("choices") or []:
+                                delta = (choice.get("delta") or {}).get("content")
+                                if delta:
+                                    started = True
+                                    yield delta
+                        return
+            except httpx.TransportError as e:
+                if started:
+                    raise OpenRouterError(f"stream interrupted: {e}") from e
+                error = e
+            if attempt == self.max_retries:
+                raise OpenRouterError(f"giving up after {attempt + 1} attempts: {error}") from error
+            wait = _backoff(attempt, resp)
+            print(f"  [openrouter] {error}; retrying in {wait:.1f}s ({attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(wait)
+
+    async def aclose(self) -> None:
+        if self._async is not None:
+            await self._async.aclose()
+            self._async = None
+
+    async def __aenter__(self) -> "OpenRouterClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    # ── Sync ─────────────────────────────────────────────
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._sync is None:
+            self._sync = httpx.Client(**self._client_kwargs)
+        return self._sync
+
+    def complete(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Blocking counterpart of acomplete (deadline checked between attempts)."""
+        deadline = time.monotonic() + self.total_timeout
+        for attempt in range(self.max_retries + 1):
+            resp = None
+            try:
+                resp = self.client.post(OPENROUTER_URL, json=payload)
+            except httpx.TransportError as e:
+                error: Exception = e
+            else:
+                if resp.status_code not in RETRY_STATUSES:
+                    resp.raise_for_status()
+                    return resp.json()
+                error = httpx.HTTPStatusError(
+                    f"HTTP {resp.status_code}", request=resp.request, response=resp
+                )
+            wait = _backoff(attempt, resp)
+            if attempt == self.max_retries or time.monotonic() + wait > deadline:
+                raise OpenRouterError(f"giving up after {attempt + 1} attempts: {error}") from error
+            print(f"  [openrouter] {error}; retrying in {wait:.1f}s ({attempt + 1}/{self.max_retries})")
+            time.sleep(wait)
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        if self._sync is not None:
+            self._sync.close()
+            self._sync = None
+
+    def __enter__(self) -> "OpenRouterClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
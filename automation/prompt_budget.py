@@ -0,0 +1,163 @@
+"""
+Token-budgeted compaction of the PAPERS block sent to the LLM.
+
+Token counts come from a local estimate (no tokenizer download, no API
+call) that tracks BPE tokenizers closely enough to size prompts. Given a
+budget, every paper keeps its header (title, URL, authors) and the
+remaining tokens are shared out across abstracts by rank: papers are
+assumed to arrive best-first (screen_papers order), and higher-ranked
+papers get longer abstracts. Whitespace runs and boilerplate sentences
+(code-availability notes, venue notices) are removed before anything
+useful is cut.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import Sequence
+
+from automation.ingest_arxiv import ArxivPaper
+
+# Token budget for the PAPERS block of one prompt.
+PROMPT_TOKEN_BUDGET = int(os.environ.get("MVPXIV_PROMPT_TOKEN_BUDGET", "12000"))
+MIN_ABSTRACT_TOKENS = 40
+MAX_AUTHORS = 5
+# Weight of rank r (0-based) is 1 / (1 + RANK_DECAY * r / n).
+RANK_DECAY = 2.0
+
+_PIECE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_WS = re.compile(r"\s+")
+_URL = re.compile(r"https?://\S+|www\.\S+")
+_BOILERPLATE = re.compile(
+    r"(?:^|(?<=[.!?]\s))"
+    r"(?:(?:our |the |all )?(?:code|source code|data|datasets?|models?|implementation|project page)"
+    r"[^.]{0,80}?\b(?:available|released|open-sourced|public)\b[^.]*"
+    r"|(?:accepted|to appear|published) (?:at|in|to|by) [^.]*"
+    r"|this (?:paper|work) (?:has been|was) accepted[^.]*"
+    r"|\d+ pages?,[^.]*)\.?\s*",
+    re.IGNORECASE,
+)
+_IN_THIS_PAPER = re.compile(r"\bIn this (?:paper|work|study), we\b", re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local BPE-style estimate: one token per word/number/symbol piece, plus
+    one per extra ~6 letters of long words.
+    """
+    return sum(1 + (len(piece) - 1) // 6 for piece in _PIECE.findall(text))
+
+
+def compact_abstract(text: str) -> str:
+    """Collapse whitespace and drop boilerplate that carries no signal for ideation."""
+    text = _WS.sub(" ", text).strip()
+    text = _URL.sub("", text)
+    text = _BOILERPLATE.sub("", text)
+    text = _IN_THIS_PAPER.sub("We", text)
+    return _WS.sub(" ", text).strip()
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to about max_tokens, preferring a sentence (then word) boundary."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    used = 0
+    end = 0
+    for match in _PIECE.finditer(text):
+        used += 1 + (len(match.group()) - 1) // 6
+        if used > max_tokens:
+            break
+        end = match.end()
+    cut = text[:end]
+    sentence = cut.rfind(". ")
+    if sentence > len(cut) * 0.6:
+        return cut[: sentence + 1]
+    return cut.rstrip(" ,;:") + "…"
+
+
+def _header(index: int, paper: ArxivPaper) -> str:
+    return (
+        f"{index}. [{paper.primary_category}] {_WS.sub(' ', paper.title).strip()}\n"
+        f"   URL: {paper.url}\n"
+        f"   Authors: {', '.join(paper.authors[:MAX_AUTHORS])}\n"
+    )
+
+
+def _allocate(needs: list[int], budget: int) -> list[int]:
+    """
+    Split `budget` tokens across abstracts by rank weight, never giving
+    one more than it needs; whatever a short abstract leaves over is
+    shared among the rest (water filling).
+    """
+    n = len(needs)
+    alloc = [0] * n
+    open_idx = [i for i in range(n) if needs[i] > 0]
+    remaining = budget
+    while open_idx and remaining > 0:
+        weights = {i: 1.0 / (1.0 + RANK_DECAY * i / n) for i in open_idx}
+        total = sum(weights.values())
+        share = {i: int(remaining * w / total) for i, w in weights.items()}
+        satisfied = [i for i in open_idx if alloc[i] + share[i] >= needs[i]]
+        if not satisfied:
+            for i in open_idx:
+                alloc[i] += share[i]
+            break
+        for i in satisfied:
+            remaining -= needs[i] - alloc[i]
+            alloc[i] = needs[i]
+        open_idx = [i for i in open_idx if i not in satisfied]
+    return alloc
+
+
+def build_papers_block(
+    papers: Sequence[ArxivPaper],
+    token_budget: int = PROMPT_TOKEN_BUDGET,
+) -> tuple[str, int]:
+    """
+    Render the numbered PAPERS list within about token_budget tokens.
+    Returns (block, estimated tokens). If even the headers plus a minimal
+    abstract for every paper do not fit, the lowest-ranked papers are
+    left out.
+    """
+    papers = list(papers)
+    headers = [_header(i, p) for i, p in enumerate(papers, 1)]
+    header_tokens = [estimate_tokens(h) + 3 for h in headers]  # + "Abstract:" label
+
+    keep = len(papers)
+    while keep > 1 and sum(header_tokens[:keep]) + MIN_ABSTRACT_TOKENS * keep > token_budget:
+        keep -= 1
+    if keep < len(papers):
+        print(f"  [prompt] Budget {token_budget} fits only {keep}/{len(papers)} papers; dropping the rest")
+
+    abstracts = [compact_abstract(p.abstract) for p in papers[:keep]]
+    needs = [estimate_tokens(a) for a in abstracts]
+    alloc = _allocate(needs, token_budget - sum(header_tokens[:keep]))
+
+    lines = [
+        f"{header}   Abstract: {truncate_to_tokens(abstract, max(limit, MIN_ABSTRACT_TOKENS))}\n"
+        for header, abstract, limit in zip(headers, abstracts, alloc)
+    ]
+    block = "\n".join(lines)
+    return block, estimate_tokens(block)
+
+
+if __name__ == "__main__":
+    import sys
+
+    sample = [
+        ArxivPaper(
+            title=f"Paper {i}",
+            url=f"https://arxiv.org/abs/2610.{i:05d}",
+            authors=["A. Author", "B. Author"],
+            abstract=("In this paper, we propose an efficient agent framework for tool use. " * 12)
+            + "Code is available at https://github.com/example/repo.",
+            arxiv_id=f"2610.{i:05d}v1",
+            published_at="2026-10-14",
+            primary_category="cs.LG",
+        )
+        for i in range(int(sys.argv[1]) if len(sys.argv) > 1 else 60)
+    ]
+    for budget in (4000, 8000, PROMPT_TOKEN_BUDGET, 40000):
+        _, tokens = build_papers_block(sample, budget)
+        print(f"budget {budget:>6}: ~{tokens} tokens for {len(sample)} papers")
@@ -0,0 +1,181 @@
+"""
+Local relevance pre-ranking of candidate papers (CPU only, no LLM calls).
+
+Papers are vectorized as hashed TF-IDF (unigrams + bigrams, sublinear tf,
+L2-normalized, kept as sparse nonzero entries) with NumPy and compared
+against the text of ideas that previously landed in PROMISING or
+LUCRATIVE. A paper's relevance blends its best match against any single
+reference idea with its similarity to the reference centroid, so both
+"close to one past winner" and "close to what tends to win" count. Only
+the top-K papers continue to screening and the blueprint prompt.
+
+With no reference ideas yet (fresh database), ranking is a no-op.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import zlib
+from typing import Any, Sequence
+
+import numpy as np
+
+from automation.ingest_arxiv import ArxivPaper
+
+# Keep well above screening.SCREEN_TOP_K (60): ranking is the cheap coarse
+# cut, screening picks among what is left.
+RANK_TOP_K = int(os.environ.get("MVPXIV_RANK_TOP_K", "150"))
+REFERENCE_CATEGORIES = ("PROMISING", "LUCRATIVE")
+REFERENCE_LIMIT = 500
+N_FEATURES = 2**14
+# relevance = MAX_WEIGHT * best single match + (1 - MAX_WEIGHT) * centroid match
+MAX_WEIGHT = 0.5
+
+_TOKEN = re.compile(r"[a-z][a-z0-9\-]{2,}")
+_STOPWORDS = frozenset(
+    """
+    the and for with that this from are was were been have has into our their its
+    which these those such than then them they can also using use used based via
+    show shows propose proposed approach method methods paper work results new
+    novel however while over under between both each more most other only well
+    """.split()
+)
+
+
+def _terms(text: str) -> list[str]:
+    words = [w for w in _TOKEN.findall(text.lower()) if w not in _STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def hashed_terms(text: str, n_features: int = N_FEATURES) -> tuple[np.ndarray, np.ndarray]:
+    """Sparse hashed term counts of text: (sorted unique columns, counts)."""
+    cols = np.fromiter(
+        (zlib.crc32(term.encode()) % n_features for term in _terms(text)), dtype=np.int64
+    )
+    cols, counts = np.unique(cols, return_counts=True)
+    return cols, counts.astype(np.float32)
+
+
+def _hashed_counts(
+    texts: Sequence[str], n_features: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Nonzero hashed term counts of all texts as parallel (row, col, count) arrays."""
+    terms = [hashed_terms(text, n_features) for text in texts]
+    rows = np.repeat(np.arange(len(texts)), [len(cols) for cols, _ in terms])
+    if not terms:
+        return rows, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    return rows, np.concatenate([c for c, _ in terms]), np.concatenate([v for _, v in terms])
+
+
+def tfidf_vectors(
+    texts: Sequence[str], n_features: int = N_FEATURES
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Hashed, sublinear-tf, smoothed-idf, L2-normalized document vectors as
+    parallel (row, col, weight) arrays of their nonzero entries, grouped by
+    row. A few hundred texts hold ~10^5 entries instead of a dense
+    len(texts) x n_features matrix.
+    """
+    rows, cols, counts = _hashed_counts(texts, n_features)
+    df = np.bincount(cols, minlength=n_features)
+    idf = np.log((1 + len(texts)) / (1 + df)).astype(np.float32) + 1.0
+    weights = np.log1p(counts) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=len(texts)))
+    return rows, cols, (weights / np.maximum(norms[rows], 1e-12)).astype(np.float32)
+
+
+def paper_text(paper: ArxivPaper) -> str:
+    return f"{paper.title}. {paper.title}. {paper.abstract}"
+
+
+def idea_text(row: dict[str, Any]) -> str:
+    return " ".join(
+        str(row.get(key) or "")
+        for key in ("paper_title", "paper_abstract", "technical_core", "value_proposition")
+    )
+
+
+def load_reference_texts(client, limit: int = REFERENCE_LIMIT) -> list[str]:
+    """Text of the most recent PROMISING/LUCRATIVE ideas. Empty on any failure."""
+    try:
+        rows = (
+            client.table("ideas")
+            .select("paper_title,paper_abstract,technical_core,value_proposition")
+            .in_("category", list(REFERENCE_CATEGORIES))
+            .order("created_at", desc=True)
+            .limit(limit)
+            .execute()
+            .data
+        )
+    except Exception as e:
+        print(f"  [rank] Could not load reference ideas: {e}")
+        return []
+    return [idea_text(row) for row in rows or []]
+
+
+def relevance_scores(papers: Sequence[ArxivPaper], references: Sequence[str]) -> np.ndarray:
+    """Cosine relevance of each paper to the reference ideas, in [0, 1]."""
+    n = len(papers)
+    rows, cols, weights = tfidf_vectors([paper_text(p) for p in papers] + list(references))
+    split = np.searchsorted(rows, n)
+    cand_rows, cand_cols, cand_w = rows[:split], cols[:split], weights[:split]
+    ref_rows, ref_cols, ref_w = rows[split:] - n, cols[split:], weights[split:]
+
+    centroid = np.bincount(ref_cols, weights=ref_w, minlength=N_FEATURES) / len(references)
+    centroid /= max(float(np.linalg.norm(centroid)), 1e-12)
+    centroid_match = np.bincount(cand_rows, weights=centroid[cand_cols] * cand_w, minlength=n)
+
+    # One dense query vector at a time, dotted against every reference's nonzeros.
+    best = np.zeros(n)
+    query = np.zeros(N_FEATURES, dtype=np.float32)
+    bounds = np.searchsorted(cand_rows, np.arange(n + 1))
+    for i in range(n):
+        own = cand_cols[bounds[i] : bounds[i + 1]]
+        query[own] = cand_w[bounds[i] : bounds[i + 1]]
+        sims = np.bincount(ref_rows, weights=query[ref_cols] * ref_w, minlength=len(references))
+        best[i] = sims.max()
+        query[own] = 0.0
+    return MAX_WEIGHT * best + (1 - MAX_WEIGHT) * centroid_match
+
+
+def rank_papers(
+    papers: list[ArxivPaper],
+    references: Sequence[str],
+    top_k: int = RANK_TOP_K,
+) -> list[ArxivPaper]:
+    """
+    Return the top_k papers by relevance, best first. Returns the input
+    unchanged when there are no references or top_k <= 0.
+    """
+    if top_k <= 0 or not papers:
+        return papers
+    if not references:
+        print("  [rank] No reference ideas yet; keeping ingest order")
+        return papers
+    scores = relevance_scores(papers, references)
+    # Stable sort on -score keeps ingest order among ties.
+    order = np.argsort(-scores, kind="stable")[:top_k]
+    ranked = [papers[i] for i in order]
+    print(
+        f"  [rank] Kept top {len(ranked)}/{len(papers)} papers against {len(references)} reference ideas "
+        f"(relevance {scores[order[-1]]:.3f}–{scores[order[0]]:.3f})"
+    )
+    return ranked
+
+
+if __name__ == "__main__":
+    import time
+
+    references = [
+        "Agentic workflow automation for document extraction with retrieval and tool use",
+        "Efficient on-device inference for small language models with quantization",
+    ]
+    papers = [
+        ArxivPaper("Tool-using agents for invoice extraction", "u1", [], "We build an agent workflow with retrieval for document extraction.", "1", "", "cs.AI"),
+        ArxivPaper("Regret bounds for bandits", "u2", [], "We prove asymptotic regret bounds under convexity.", "2", "", "cs.LG"),
+        ArxivPaper("Quantized SLMs on phones", "u3", [], "On-device inference of small language models with 4-bit quantization.", "3", "", "cs.LG"),
+    ]
+    start = time.perf_counter()
+    top = rank_papers(papers, references, top_k=2)
+    print(f"{len(papers)} papers ranked in {time.perf_counter() - start:.2f}s: {[p.title for p in top]}")
@@ -1,25 +1,28 @@
 """
 MVPXiv daily pipeline orchestrator.
 
-1. Ingest newest arXiv papers (cs.LG, cs.MA)
-2. Call LLM with 4-model fallback to generate blueprints
+1. Ingest newest arXiv papers (cs.LG, cs.MA, cs.AI, cs.CL by default)
+2. Pre-rank and screen candidates, then call LLM with model fallback to generate blueprints
 3. Apply categorization rubric
-4. Persist Batch + Ideas to Supabase
+4. Persist Batch + Ideas to Supabase, then refresh "similar ideas"
 
 Usage:
   cd /path/to/MVPXiv
-  python -m automation.run_daily
+  python -m automation.run_daily [--date YYYY-MM-DD] [--resume] [...]
+  python -m automation.run_daily --help   # all options
 """
 
 from __future__ import annotations
 
+import argparse
 import os
 import re
 import sys
-import uuid
 from datetime import datetime, timezone
 from collections import Counter
+from dataclasses import asdict
 
+import httpx
 from dotenv import load_dotenv
 
 # Load .env from project root
@@ -27,9 +30,22 @@ load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
 from supabase import create_client
 
-from automation.ingest_arxiv import fetch_recent_papers
-from automation.llm_pipeline import generate_blueprints
+from automation.checkpoints import STAGES, CheckpointStore
+from automation.dedup import IdeaIndex, filter_papers, flag_duplicates, stable_idea_id
+from automation.harvest_arxiv import harvest_daily_papers
+from automation.ingest_arxiv import DEFAULT_CATEGORIES, ArxivPaper, fetch_recent_papers
+from automation.state import IngestIndex
+from automation.llm_pipeline import (
+    GENERATION_MODE,
+    HEDGE_DELAY_SECONDS,
+    STREAM_RESPONSES,
+    generate_blueprints,
+)
 from automation.categorize import apply_rubric, enforce_distribution
+from automation.rank import RANK_TOP_K, load_reference_texts, rank_papers
+from automation.screening import SCREEN_TOP_K, screen_papers, screening_stats
+from automation.similar import update_neighbors
+from automation.snapshots import export_snapshots
 
 
 def _safe_date(val: str | None) -> str | None:
@@ -39,6 +55,28 @@ def _safe_date(val: str | None) -> str | None:
     return None
 
 
+def notify_api(batch_date: str) -> None:
+    """
+    Tell the read API to drop its response cache (POST /api/cache/invalidate).
+    No-op unless MVPXIV_API_URL and CACHE_INVALIDATE_TOKEN are set; the API
+    also notices new batches on its own within its version-check interval.
+    """
+    url = os.environ.get("MVPXIV_API_URL")
+    token = os.environ.get("CACHE_INVALIDATE_TOKEN")
+    if not url or not token:
+        return
+    try:
+        resp = httpx.post(
+            f"{url.rstrip('/')}/api/cache/invalidate",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        print(f"  Invalidated API cache for {batch_date}")
+    except httpx.HTTPError as e:
+        print(f"  Could not invalidate API cache: {e}")
+
+
 def get_supabase_client():
     url = os.environ["SUPABASE_URL"]
     key = os.environ["SUPABASE_SERVICE_ROLE_KEY"]
@@ -48,42 +86,140 @@ def get_supabase_client():
 def run_pipeline(
     max_papers_per_category: int = 25,
     date_override: str | None = None,
+    incremental: bool = True,
+    ingest_backend: str = "search",
+    use_llm_cache: bool = True,
+    resume: bool = False,
+    hedge_delay: float | None = HEDGE_DELAY_SECONDS,
+    generation_mode: str = GENERATION_MODE,
+    categories: list[str] | None = None,
+    screen_top_k: int = SCREEN_TOP_K,
+    stream: bool = STREAM_RESPONSES,
+    rank_top_k: int = RANK_TOP_K,
+    dedup: bool = True,
+    snapshots: bool = True,
 ) -> bool:
     """
     Run the full daily pipeline. Returns True on success.
+
+    With incremental=True, papers already processed by an earlier batch
+    (tracked in the local IngestIndex) are skipped at ingest time.
+    ingest_backend selects per-category arXiv search ("search") or one
+    bulk OAI-PMH harvest of the day's announcements ("harvest").
+    use_llm_cache=False bypasses the on-disk LLM response cache.
+    hedge_delay races the next fallback model after that many seconds.
+    generation_mode is "batch" (one response) or "per_paper" (select, then
+    one concurrent call per blueprint). stream=True streams batch-mode
+    responses and abandons ones that go wrong early.
+    Papers are first pre-ranked locally against past PROMISING/LUCRATIVE
+    ideas, keeping rank_top_k (0 disables). When more than screen_top_k
+    remain, a map-reduce screening pass keeps only the best screen_top_k
+    for the blueprint prompt.
+    With dedup=True, papers that already produced an idea are dropped
+    before generation and near-duplicate ideas are flagged after it, using
+    the local IdeaIndex.
+    With snapshots=True, static JSON snapshots of the read API are
+    refreshed after persisting (automation/snapshots.py).
+
+    Every stage checkpoints its output per batch date; resume=True reuses
+    them and restarts after the last completed stage. A non-resume run
+    discards the date's old checkpoints.
     """
     today = date_override or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    categories = categories or DEFAULT_CATEGORIES
     print(f"{'='*60}")
     print(f"  MVPXiv Daily Pipeline — {today}")
     print(f"{'='*60}")
 
+    checkpoints = CheckpointStore(today)
+    completed = 0
+    if resume:
+        last = checkpoints.last_completed()
+        completed = STAGES.index(last) + 1 if last else 0
+        print(f"  Resuming after: {last or 'nothing (no checkpoints)'}")
+        if completed == len(STAGES):
+            print("  All stages already completed for this date.")
+            return True
+    else:
+        checkpoints.clear()
+
     # ── Step 1: Ingest papers ────────────────────────────
     print("\n[1/4] Fetching papers from arXiv...")
-    papers = fetch_recent_papers(
-        categories=["cs.LG", "cs.MA", "cs.AI", "cs.CL"],
-        max_per_category=max_papers_per_category,
-    )
-    if not papers:
-        print("  No papers found. Aborting.")
-        return False
+    index = IngestIndex() if incremental else None
+    if completed > STAGES.index("ingest"):
+        papers = [ArxivPaper(**p) for p in checkpoints.load("ingest")]
+        print(f"  Loaded {len(papers)} papers from checkpoint")
+    else:
+        ingest = harvest_daily_papers if ingest_backend == "harvest" else fetch_recent_papers
+        ingest_kwargs = {"day": today} if ingest_backend == "harvest" else {}
+        papers = ingest(
+            categories=categories,
+            max_per_category=max_papers_per_category,
+            index=index,
+            batch_date=today,
+            **ingest_kwargs,
+        )
+        if not papers:
+            print("  No new papers found. Aborting.")
+            return False
+        checkpoints.save("ingest", [asdict(p) for p in papers])
 
     # ── Step 2: Generate blueprints via LLM ──────────────
     print("\n[2/4] Generating blueprints via LLM...")
-    api_key = os.environ["OPENROUTER_API_KEY"]
-    result = generate_blueprints(api_key, papers)
-    if not result:
-        print("  LLM pipeline failed. Aborting.")
-        return False
+    idea_index = IdeaIndex() if dedup else None
+    if idea_index is not None and not len(idea_index):
+        try:
+            print(f"  [dedup] Bootstrapped index with {idea_index.bootstrap(get_supabase_client())} ideas")
+        except Exception as e:
+            print(f"  [dedup] Could not bootstrap index: {e}")
+    if completed > STAGES.index("generate"):
+        result = checkpoints.load("generate")
+        print("  Loaded LLM output from checkpoint")
+    else:
+        api_key = os.environ["OPENROUTER_API_KEY"]
+        candidates = papers
+        if idea_index is not None:
+            candidates = filter_papers(candidates, idea_index, exclude_batch=today)
+        if rank_top_k > 0 and len(candidates) > rank_top_k:
+            candidates = rank_papers(candidates, load_reference_texts(get_supabase_client()), rank_top_k)
+        candidates = screen_papers(
+            candidates,
+            top_k=screen_top_k,
+            api_key=api_key,
+            use_cache=use_llm_cache,
+        )
+        result = generate_blueprints(
+            api_key,
+            candidates,
+            use_cache=use_llm_cache,
+            hedge_delay=hedge_delay,
+            mode=generation_mode,
+            stream=stream,
+        )
+        if not result:
+            print("  LLM pipeline failed. Aborting.")
+            return False
+        if screening := screening_stats():
+            result.setdefault("_stats", {})["screening"] = screening
+        if idea_index is not None:
+            result.setdefault("_stats", {})["duplicates_flagged"] = flag_duplicates(
+                result["ideas"], idea_index, exclude_batch=today
+            )
+        checkpoints.save("generate", result)
 
     research_themes = result["researchThemes"]
-    ideas_raw = result["ideas"]
     print(f"  Themes: {research_themes}")
-    print(f"  Raw ideas: {len(ideas_raw)}")
+    print(f"  Raw ideas: {len(result['ideas'])}")
 
     # ── Step 3: Apply categorization rubric ──────────────
     print("\n[3/4] Applying categorization rubric...")
-    ideas_categorized = apply_rubric(ideas_raw)
-    ideas_categorized = enforce_distribution(ideas_categorized)
+    if completed > STAGES.index("categorize"):
+        ideas_categorized = checkpoints.load("categorize")
+        print("  Loaded categorized ideas from checkpoint")
+    else:
+        ideas_categorized = apply_rubric(result["ideas"])
+        ideas_categorized = enforce_distribution(ideas_categorized)
+        checkpoints.save("categorize", ideas_categorized)
 
     category_counts = Counter(idea["category"] for idea in ideas_categorized)
     for cat in ["BACKLOG", "CONSIDERABLE", "PROMISING", "LUCRATIVE"]:
@@ -93,40 +229,29 @@ def run_pipeline(
     print("\n[4/4] Persisting to Supabase...")
     client = get_supabase_client()
 
-    # Delete existing data for this date (idempotent re-runs)
-    client.table("ideas").delete().eq("batch_date", today).execute()
-    client.table("batches").delete().eq("id", today).execute()
-
-    # Insert batch FIRST (ideas have a foreign key to batches)
     batch_row = {
         "id": today,
         "date": today,
-        "sources": [
-            "cs.LG",
-            "cs.MA",
-            "cs.AI",
-            "cs.CL",
-            "https://arxiv.org/list/cs.LG/new",
-            "https://arxiv.org/list/cs.MA/new",
-            "https://arxiv.org/list/cs.AI/new",
-            "https://arxiv.org/list/cs.CL/new",
-        ],
+        "sources": categories + [f"https://arxiv.org/list/{cat}/new" for cat in categories],
         "research_themes": research_themes[:3],
         "counts_backlog": category_counts.get("BACKLOG", 0),
         "counts_considerable": category_counts.get("CONSIDERABLE", 0),
         "counts_promising": category_counts.get("PROMISING", 0),
         "counts_lucrative": category_counts.get("LUCRATIVE", 0),
     }
-    client.table("batches").upsert(batch_row).execute()
-    print(f"  Upserted batch: {today}")
 
     # Build idea rows
     idea_rows = []
+    used_ids: set[str] = set()
     for idea in ideas_categorized:
+        idea_id = stable_idea_id(today, idea)
+        if idea_id in used_ids:  # two ideas on the same paper
+            idea_id = stable_idea_id(today, {"startupName": f"{idea_id}:{idea.get('startupName')}"})
+        used_ids.add(idea_id)
         paper = idea.get("paper", {})
         scores = idea.get("scores", {})
         row = {
-            "id": str(uuid.uuid4()),
+            "id": idea_id,
             "batch_date": today,
             "category": idea["category"],
             "startup_name": idea.get("startupName", "Untitled"),
@@ -150,17 +275,132 @@ def run_pipeline(
         }
         idea_rows.append(row)
 
-    # Insert ideas
-    if idea_rows:
-        client.table("ideas").insert(idea_rows).execute()
-        print(f"  Inserted {len(idea_rows)} ideas")
+    # Replace the batch and its ideas in one transaction (idempotent re-runs)
+    resp = client.rpc("replace_batch", {"batch": batch_row, "ideas": idea_rows}).execute()
+    print(f"  Replaced batch {today}: {(resp.data or {}).get('ideas', len(idea_rows))} ideas")
+
+    if index is not None:
+        marked = index.mark_processed(papers, today)
+        index.close()
+        print(f"  Marked {marked} papers as processed")
+    if idea_index is not None:
+        idea_index.remove_batch(today)
+        idea_index.add(idea_rows)
+        idea_index.close()
+    try:
+        update_neighbors(client, idea_rows, today)
+    except Exception as e:
+        print(f"  [similar] Could not update neighbour lists: {e}")
+    if snapshots:
+        try:
+            export_snapshots(client, batch_date=today)
+        except Exception as e:
+            print(f"  [snapshots] Could not export snapshots: {e}")
+
+    checkpoints.save("persist", {"batch": today, "idea_ids": [r["id"] for r in idea_rows]})
+    notify_api(today)
 
     print(f"\n{'='*60}")
     print(f"  Pipeline complete! {len(idea_rows)} ideas for {today}")
+    for key, value in result.get("_stats", {}).items():
+        print(f"  {key}: {value}")
     print(f"{'='*60}")
     return True
 
 
 if __name__ == "__main__":
-    success = run_pipeline()
+    parser = argparse.ArgumentParser(description="MVPXiv daily pipeline")
+    parser.add_argument("--date", dest="date_override", help="Override batch date (YYYY-MM-DD)")
+    parser.add_argument(
+        "--ingest",
+        choices=["search", "harvest"],
+        default="search",
+        help="arXiv ingestion backend (default: search)",
+    )
+    parser.add_argument(
+        "--categories",
+        default=",".join(DEFAULT_CATEGORIES),
+        help="Comma-separated arXiv categories to ingest",
+    )
+    parser.add_argument(
+        "--max-per-category",
+        type=int,
+        default=25,
+        help="Maximum papers fetched per category",
+    )
+    parser.add_argument(
+        "--rank-top-k",
+        type=int,
+        default=RANK_TOP_K,
+        help="Papers kept by the local relevance pre-ranker (0 = off)",
+    )
+    parser.add_argument(
+        "--screen-top-k",
+        type=int,
+        default=SCREEN_TOP_K,
+        help="Papers kept by screening for the blueprint prompt",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the local processed-paper index and re-ingest everything",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Do not skip used papers or flag near-duplicate ideas",
+    )
+    parser.add_argument(
+        "--no-snapshots",
+        action="store_true",
+        help="Do not refresh the static JSON snapshots after persisting",
+    )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Bypass the on-disk LLM response cache",
+    )
+    parser.add_argument(
+        "--hedge-delay",
+        type=float,
+        default=HEDGE_DELAY_SECONDS,
+        help="Race the next fallback model after N seconds (0 = all at once)",
+    )
+    parser.add_argument(
+        "--generation",
+        choices=["batch", "per_paper"],
+        default=GENERATION_MODE,
+        help="One response for all ideas, or selection + one call per blueprint",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=STREAM_RESPONSES,
+        help="Stream batch-mode LLM responses and validate ideas incrementally",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume from the last completed stage checkpoint for this date",
+    )
+    args = parser.parse_args()
+    if args.date_override and not _safe_date(args.date_override):
+        parser.error(f"--date must be YYYY-MM-DD, got {args.date_override!r}")
+
+    success = run_pipeline(
+        max_papers_per_category=args.max_per_category,
+        date_override=_safe_date(args.date_override),
+        incremental=not args.full,
+        ingest_backend=args.ingest,
+        use_llm_cache=not args.no_llm_cache,
+        resume=args.resume,
+        hedge_delay=args.hedge_delay,
+        generation_mode=args.generation,
+        categories=[c.strip() for c in args.categories.split(",") if c.strip()],
+        screen_top_k=args.screen_top_k,
+        stream=args.stream,
+        rank_top_k=args.rank_top_k,
+        dedup=not args.no_dedup,
+        snapshots=not args.no_snapshots,
+    )
     sys.exit(0 if success else 1)
@@ -0,0 +1,329 @@
+"""
+Precomputed "similar ideas" for GET /api/ideas/{id}/similar.
+
+Every persisted idea is kept as a sparse hashed term vector (rank.py's
+unigrams + bigrams over idea and paper text) in the state SQLite
+database, next to its current top-K neighbours from other batches.
+When run_daily persists a batch, only the new ideas are compared against
+the corpus (one sparse dot product each, TF-IDF weighted with the current
+document frequencies); since cosine similarity is symmetric, the same
+scores also decide whether a new idea enters an older idea's list. Only
+the lists that changed are pushed to Supabase's idea_neighbors table, so
+the API answers with a single indexed lookup.
+
+Older lists keep the IDF they were computed with; `--rebuild` recomputes
+every list from scratch. An empty index is bootstrapped (and rebuilt)
+from Supabase.
+
+Usage:
+  python -m automation.similar --rebuild
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from typing import Any, Iterable
+
+import numpy as np
+
+from automation.rank import N_FEATURES, hashed_terms
+from automation.state import STATE_DIR
+
+SIMILAR_TOP_K = 10
+MIN_SIMILARITY = 0.05
+PUSH_CHUNK = 500  # idea lists per replace_idea_neighbors call
+
+NEIGHBOR_TEXT_COLUMNS = (
+    "id,batch_date,startup_name,value_proposition,technical_core,tech_stack,paper_title,paper_abstract"
+)
+
+Neighbors = list[tuple[str, float]]
+
+
+def idea_text(row: dict[str, Any]) -> str:
+    return " ".join(
+        [
+            str(row.get("startup_name") or ""),
+            str(row.get("value_proposition") or ""),
+            str(row.get("technical_core") or ""),
+            " ".join(row.get("tech_stack") or []),
+            str(row.get("paper_title") or ""),
+            str(row.get("paper_abstract") or ""),
+        ]
+    )
+
+
+class _Corpus:
+    """All stored vectors, flattened for vectorized sparse dot products."""
+
+    def __init__(self, rows: list[tuple[str, str, bytes, bytes]]):
+        self.ids = [r[0] for r in rows]
+        self.batches = np.array([r[1] for r in rows], dtype=object)
+        self.position = {idea_id: i for i, idea_id in enumerate(self.ids)}
+        cols = [np.frombuffer(r[2], dtype=np.int64) for r in rows]
+        tf = [np.frombuffer(r[3], dtype=np.float32) for r in rows]
+        lengths = [len(c) for c in cols]
+        self.row_of = np.repeat(np.arange(len(rows)), lengths)
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        self.cols = np.concatenate(cols) if rows else np.zeros(0, dtype=np.int64)
+        tf_all = np.concatenate(tf) if rows else np.zeros(0, dtype=np.float32)
+
+        df = np.bincount(self.cols, minlength=N_FEATURES)
+        self.idf = (np.log((1 + len(rows)) / (1 + df)) + 1.0).astype(np.float32)
+        weights = tf_all * self.idf[self.cols]
+        norms = np.sqrt(np.bincount(self.row_of, weights=weights**2, minlength=len(rows)))
+        self.weights = (weights / np.maximum(norms[self.row_of], 1e-12)).astype(np.float32)
+
+    def similarities(self, idea_id: str) -> np.ndarray:
+        """Cosine similarity of one stored idea to every idea in the corpus."""
+        i = self.position[idea_id]
+        start, end = self.offsets[i], self.offsets[i + 1]
+        query = np.zeros(N_FEATURES, dtype=np.float32)
+        query[self.cols[start:end]] = self.weights[start:end]
+        return np.bincount(
+            self.row_of, weights=query[self.cols] * self.weights, minlength=len(self.ids)
+        )
+
+    def top_neighbors(self, idea_id: str, sims: np.ndarray, top_k: int) -> Neighbors:
+        """Best top_k ideas from other batches (never the idea's own batch)."""
+        sims = np.where(self.batches == self.batches[self.position[idea_id]], -1.0, sims)
+        k = min(top_k, len(sims))
+        if k == 0:
+            return []
+        best = np.argpartition(-sims, k - 1)[:k]
+        best = best[np.argsort(-sims[best], kind="stable")]
+        return [(self.ids[j], round(float(sims[j]), 4)) for j in best if sims[j] >= MIN_SIMILARITY]
+
+
+class NeighborIndex:
+    """SQLite-backed term vectors and top-K neighbour lists of persisted ideas."""
+
+    def __init__(self, path: str | None = None, top_k: int = SIMILAR_TOP_K):
+        self.path = path or os.path.join(STATE_DIR, "state.sqlite")
+        self.top_k = top_k
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(
+            """
+            create table if not exists idea_vectors (
+              idea_id    text primary key,
+              batch_date text not null,
+              cols       blob not null,
+              tf         blob not null
+            );
+            create index if not exists idx_idea_vectors_batch on idea_vectors(batch_date);
+            create table if not exists idea_neighbors (
+              idea_id     text not null,
+              rank        integer not null,
+              neighbor_id text not null,
+              similarity  real not null,
+              primary key (idea_id, rank)
+            ) without rowid;
+            create index if not exists idx_idea_neighbors_neighbor on idea_neighbors(neighbor_id);
+            """
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("select count(*) from idea_vectors").fetchone()[0]
+
+    def add(self, rows: Iterable[dict[str, Any]]) -> list[str]:
+        """Store term vectors for idea rows (Supabase column names). Returns their ids."""
+        ids = []
+        with self._conn:
+            for row in rows:
+                cols, counts = hashed_terms(idea_text(row))
+                self._conn.execute(
+                    "insert or replace into idea_vectors values (?, ?, ?, ?)",
+                    (row["id"], row["batch_date"], cols.tobytes(), np.log1p(counts).tobytes()),
+                )
+                ids.append(row["id"])
+        return ids
+
+    def remove_batch(self, batch_date: str) -> set[str]:
+        """
+        Forget a batch's ideas. Returns the ids of other ideas whose lists
+        pointed at them; those lists need recomputing.
+        """
+        removed = "select idea_id from idea_vectors where batch_date = ?"
+        with self._conn:
+            damaged = {
+                r[0]
+                for r in self._conn.execute(
+                    f"select distinct idea_id from idea_neighbors where neighbor_id in ({removed})",
+                    (batch_date,),
+                )
+            }
+            self._conn.execute(
+                f"delete from idea_neighbors where idea_id in ({removed}) or neighbor_id in ({removed})",
+                (batch_date, batch_date),
+            )
+            self._conn.execute("delete from idea_vectors where batch_date = ?", (batch_date,))
+        return damaged
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("delete from idea_neighbors")
+            self._conn.execute("delete from idea_vectors")
+
+    def neighbors(self, idea_id: str) -> Neighbors:
+        rows = self._conn.execute(
+            "select neighbor_id, similarity from idea_neighbors where idea_id = ? order by rank",
+            (idea_id,),
+        )
+        return [(r[0], r[1]) for r in rows]
+
+    def _corpus(self) -> _Corpus:
+        return _Corpus(self._conn.execute("select idea_id, batch_date, cols, tf from idea_vectors").fetchall())
+
+    def _save(self, lists: dict[str, Neighbors]) -> None:
+        with self._conn:
+            for idea_id, neighbors in lists.items():
+                self._conn.execute("delete from idea_neighbors where idea_id = ?", (idea_id,))
+                self._conn.executemany(
+                    "insert into idea_neighbors values (?, ?, ?, ?)",
+                    [(idea_id, rank, n, sim) for rank, (n, sim) in enumerate(neighbors, 1)],
+                )
+
+    def update(self, new_ids: Iterable[str], recompute: Iterable[str] = ()) -> dict[str, Neighbors]:
+        """
+        Compute lists for new_ids (and fully recompute `recompute`), then
+        merge the new ideas into older lists they now belong to. Returns
+        every list that changed, keyed by idea id.
+        """
+        corpus = self._corpus()
+        new_ids = [i for i in new_ids if i in corpus.position]
+        changed: dict[str, Neighbors] = {}
+        sims_by_new = {}
+        for idea_id in new_ids:
+            sims_by_new[idea_id] = corpus.similarities(idea_id)
+            changed[idea_id] = corpus.top_neighbors(idea_id, sims_by_new[idea_id], self.top_k)
+        for idea_id in set(recompute) - set(new_ids):
+            if idea_id in corpus.position:
+                changed[idea_id] = corpus.top_neighbors(idea_id, corpus.similarities(idea_id), self.top_k)
+
+        if new_ids:
+            new_batches = {corpus.batches[corpus.position[i]] for i in new_ids}
+            stacked = np.vstack([sims_by_new[i] for i in new_ids])
+            best = stacked.max(axis=0)
+            for j in np.nonzero(best >= MIN_SIMILARITY)[0]:
+                old_id = corpus.ids[j]
+                if old_id in changed or corpus.batches[j] in new_batches:
+                    continue
+                current = self.neighbors(old_id)
+                floor = current[-1][1] if len(current) >= self.top_k else MIN_SIMILARITY
+                if best[j] < floor:
+                    continue
+                candidates = dict(current)
+                for row, new_id in enumerate(new_ids):
+                    if stacked[row, j] >= MIN_SIMILARITY:
+                        candidates[new_id] = round(float(stacked[row, j]), 4)
+                merged = sorted(candidates.items(), key=lambda c: c[1], reverse=True)[: self.top_k]
+                if merged != current:
+                    changed[old_id] = merged
+
+        self._save(changed)
+        return changed
+
+    def rebuild(self) -> dict[str, Neighbors]:
+        """Recompute every list with the current IDF."""
+        corpus = self._corpus()
+        lists = {
+            idea_id: corpus.top_neighbors(idea_id, corpus.similarities(idea_id), self.top_k)
+            for idea_id in corpus.ids
+        }
+        with self._conn:
+            self._conn.execute("delete from idea_neighbors")
+        self._save(lists)
+        return lists
+
+    def bootstrap(self, client, page_size: int = 1000) -> int:
+        """Fill an empty index from every idea already in Supabase (lists not computed)."""
+        total = 0
+        start = 0
+        while True:
+            rows = (
+                client.table("ideas")
+                .select(NEIGHBOR_TEXT_COLUMNS)
+                .order("created_at")
+                .range(start, start + page_size - 1)
+                .execute()
+                .data
+            ) or []
+            total += len(self.add(rows))
+            if len(rows) < page_size:
+                return total
+            start += page_size
+
+
+def push_neighbors(client, lists: dict[str, Neighbors]) -> int:
+    """Replace the given ideas' rows in Supabase's idea_neighbors. Returns rows written."""
+    items = list(lists.items())
+    written = 0
+    for start in range(0, len(items), PUSH_CHUNK):
+        chunk = items[start : start + PUSH_CHUNK]
+        rows = [
+            {"idea_id": idea_id, "rank": rank, "neighbor_id": neighbor_id, "similarity": sim}
+            for idea_id, neighbors in chunk
+            for rank, (neighbor_id, sim) in enumerate(neighbors, 1)
+        ]
+        resp = client.rpc(
+            "replace_idea_neighbors",
+            {"idea_ids": [idea_id for idea_id, _ in chunk], "neighbors": rows},
+        ).execute()
+        written += resp.data if isinstance(resp.data, int) else len(rows)
+    return written
+
+
+def update_neighbors(client, idea_rows: list[dict[str, Any]], batch_date: str) -> None:
+    """
+    run_daily hook: index a freshly persisted batch and push the changed
+    neighbour lists. Bootstraps (full rebuild) when the local index is
+    empty, which is also how a failed push recovers.
+    """
+    index = NeighborIndex()
+    try:
+        if not len(index):
+            # The batch was just persisted, so the bootstrap already includes it.
+            print(f"  [similar] Bootstrapped index with {index.bootstrap(client)} ideas")
+            lists = index.rebuild()
+        else:
+            damaged = index.remove_batch(batch_date)
+            lists = index.update(index.add(idea_rows), recompute=damaged)
+        try:
+            written = push_neighbors(client, lists)
+        except Exception:
+            index.clear()  # local lists are ahead of Supabase; rebuild next run
+            raise
+        print(f"  [similar] Updated {len(lists)} neighbour lists ({written} rows)")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from dotenv import load_dotenv
+
+    load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
+    parser = argparse.ArgumentParser(description="Maintain the similar-ideas index")
+    parser.add_argument("--rebuild", action="store_true", help="Reload all ideas and recompute every list")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.error("nothing to do (run_daily updates the index incrementally); pass --rebuild")
+
+    from supabase import create_client
+
+    client = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
+    index = NeighborIndex()
+    index.clear()
+    start = time.perf_counter()
+    print(f"Loaded {index.bootstrap(client)} ideas")
+    lists = index.rebuild()
+    print(f"Recomputed {len(lists)} lists in {time.perf_counter() - start:.1f}s")
+    print(f"Pushed {push_neighbors(client, lists)} rows")
+    index.close()
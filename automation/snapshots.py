@@ -0,0 +1,213 @@
+"""
+Static JSON snapshots of the read API.
+
+After each persisted batch, run_daily writes the responses that only
+change once a day as plain files, byte-for-byte what the API returns
+(same common.schemas models and serialization):
+
+  latest.json                GET /api/batches/latest
+  batches/index.json         GET /api/batches
+  batches/{date}.json        GET /api/batches/{date}
+  ideas/{id}.json            GET /api/ideas/{id}
+  manifest.json              {path: content hash} for every file above
+
+Each JSON file also gets .gz (and, with brotli installed, .br) copies
+compressed once at maximum ratio, which the backend sends as-is.
+
+Files are only rewritten when their content hash changes, and the manifest
+is written last, so readers never see it reference a file that isn't there
+yet. The backend can serve the directory directly (SNAPSHOT_DIR, with the
+hashes as strong ETags), and with MVPXIV_SNAPSHOT_BUCKET set the changed
+files are also uploaded to Supabase Storage for CDN delivery.
+
+Usage:
+  python -m automation.snapshots            # full export
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any
+
+from pydantic import ValidationError
+
+from automation.state import STATE_DIR
+from common.encoding import ENCODINGS, FILE_SUFFIXES, compress, content_hash
+from common.schemas import IDEA_COLUMNS, BatchWithIdeas, dump_json, row_to_batch, row_to_idea
+
+SNAPSHOT_DIR = os.environ.get("MVPXIV_SNAPSHOT_DIR", os.path.join(STATE_DIR, "snapshots"))
+SNAPSHOT_BUCKET = os.environ.get("MVPXIV_SNAPSHOT_BUCKET", "")
+SNAPSHOT_MAX_AGE = 300  # Cache-Control max-age for uploaded files, seconds
+MANIFEST = "manifest.json"
+# Storage objects can't carry a Content-Encoding, so the precompressed
+# copies keep their own types; a CDN in front of the bucket can map
+# Accept-Encoding onto the .br/.gz object.
+VARIANT_TYPES = {"br": "application/x-brotli", "gzip": "application/gzip"}
+
+
+class SnapshotWriter:
+    """Writes changed files atomically and tracks their hashes in manifest.json."""
+
+    def __init__(self, root: str):
+        self.root = root
+        try:
+            with open(os.path.join(root, MANIFEST)) as f:
+                self.files: dict[str, str] = json.load(f).get("files", {})
+        except (OSError, ValueError):
+            self.files = {}
+        self.written: set[str] = set()
+        self.changed: list[str] = []
+        self.removed: list[str] = []
+
+    def _replace(self, rel: str, body: bytes) -> None:
+        path = os.path.join(self.root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+    def variants(self, rel: str) -> list[str]:
+        """rel and its precompressed copies."""
+        return [rel] + [rel + FILE_SUFFIXES[e] for e in ENCODINGS]
+
+    def write(self, rel: str, obj: Any) -> None:
+        body = dump_json(obj)
+        digest = content_hash(body)
+        self.written.add(rel)
+        if self.files.get(rel) == digest and all(
+            os.path.exists(os.path.join(self.root, r)) for r in self.variants(rel)
+        ):
+            return
+        for encoding in ENCODINGS:
+            self._replace(rel + FILE_SUFFIXES[encoding], compress(body, encoding, best=True))
+        self._replace(rel, body)
+        self.files[rel] = digest
+        self.changed.append(rel)
+
+    def keep(self, rels: list[str]) -> None:
+        """Mark existing files as current without rewriting them."""
+        self.written.update(r for r in rels if r in self.files)
+
+    def read(self, rel: str) -> Any:
+        try:
+            with open(os.path.join(self.root, rel)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def remove(self, rel: str) -> None:
+        self.files.pop(rel, None)
+        self.removed.append(rel)
+        for path in self.variants(rel):
+            try:
+                os.remove(os.path.join(self.root, path))
+            except FileNotFoundError:
+                pass
+
+    def commit(self) -> None:
+        manifest = {
+            "generatedAt": datetime.now(timezone.utc).isoformat(),
+            "files": dict(sorted(self.files.items())),
+        }
+        self._replace(MANIFEST, json.dumps(manifest, indent=1).encode())
+
+
+def _fetch_batch(client, batch_date: str) -> BatchWithIdeas:
+    rows = (
+        client.table("batches").select(f"*, ideas({IDEA_COLUMNS})").eq("id", batch_date).limit(1).execute().data
+    )
+    row = rows[0]
+    ideas = sorted(row.pop("ideas", None) or [], key=lambda r: r.get("created_at") or "")
+    row["idea_ids"] = [str(r["id"]) for r in ideas]
+    return BatchWithIdeas(batch=row_to_batch(row), ideas=[row_to_idea(r) for r in ideas])
+
+
+def _upload(client, bucket: str, writer: SnapshotWriter) -> None:
+    storage = client.storage.from_(bucket)
+    uploads: list[tuple[str, str]] = []
+    for rel in writer.changed:
+        uploads.append((rel, "application/json"))
+        uploads += [(rel + FILE_SUFFIXES[e], VARIANT_TYPES[e]) for e in ENCODINGS]
+    uploads.append((MANIFEST, "application/json"))
+    for path, content_type in uploads:
+        with open(os.path.join(writer.root, path), "rb") as f:
+            storage.upload(
+                path,
+                f.read(),
+                {"content-type": content_type, "cache-control": str(SNAPSHOT_MAX_AGE), "upsert": "true"},
+            )
+    if writer.removed:
+        storage.remove([path for rel in writer.removed for path in writer.variants(rel)])
+    print(f"  [snapshots] Uploaded {len(uploads)} files to bucket {bucket!r}")
+
+
+def export_snapshots(
+    client,
+    root: str = SNAPSHOT_DIR,
+    batch_date: str | None = None,
+    bucket: str = SNAPSHOT_BUCKET,
+) -> list[str]:
+    """
+    Refresh the snapshot tree. With batch_date, only that batch (plus the
+    index and latest) is re-exported; otherwise, or when there is no
+    manifest yet, everything is, and files for deleted batches are
+    dropped. Returns the paths that changed.
+    """
+    writer = SnapshotWriter(root)
+    full = batch_date is None or not writer.files
+
+    batch_rows = client.table("batches").select("*, ideas(id)").order("date", desc=True).execute().data or []
+    for row in batch_rows:
+        row["idea_ids"] = [str(i["id"]) for i in row.pop("ideas", None) or []]
+    writer.write("batches/index.json", [row_to_batch(row) for row in batch_rows])
+
+    dates = [row["id"] for row in batch_rows] if full else [batch_date]
+    if batch_rows and batch_rows[0]["id"] not in dates:
+        dates.append(batch_rows[0]["id"])
+    existing = {row["id"] for row in batch_rows}
+    for date in dates:
+        if date not in existing:
+            continue
+        rel = f"batches/{date}.json"
+        previous_ids = ((writer.read(rel) or {}).get("batch") or {}).get("ideaIds", [])
+        is_latest = batch_rows[0]["id"] == date
+        try:
+            snapshot = _fetch_batch(client, date)
+        except ValidationError as e:
+            # Keep whatever was exported before rather than failing the run.
+            print(f"  [snapshots] Skipping batch {date}: {e.error_count()} invalid fields")
+            writer.keep([rel, *(f"ideas/{i}.json" for i in previous_ids)] + (["latest.json"] if is_latest else []))
+            continue
+        writer.write(rel, snapshot)
+        if is_latest:
+            writer.write("latest.json", snapshot)
+        for idea in snapshot.ideas:
+            writer.write(f"ideas/{idea.id}.json", idea)
+        kept = set(snapshot.batch.idea_ids)
+        for old_id in previous_ids:
+            if old_id not in kept:
+                writer.remove(f"ideas/{old_id}.json")
+
+    if full:
+        for rel in [r for r in writer.files if r not in writer.written]:
+            writer.remove(rel)
+    writer.commit()
+    print(
+        f"  [snapshots] {len(writer.changed)} files written, {len(writer.removed)} removed "
+        f"({len(writer.files)} total) in {root}"
+    )
+    if bucket:
+        _upload(client, bucket, writer)
+    return writer.changed
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from supabase import create_client
+
+    load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
+    client = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
+    export_snapshots(client)
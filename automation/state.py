@@ -0,0 +1,94 @@
+"""
+Local persistent pipeline state (SQLite).
+
+Tracks which arXiv papers have already been sent to the LLM and
+persisted as part of a batch, plus per-category submission-date
+watermarks derived from them. Lives under STATE_DIR, which the daily
+workflow restores between runs via actions/cache.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+from datetime import datetime, timezone
+from typing import Iterable
+
+STATE_DIR = os.environ.get("MVPXIV_STATE_DIR") or os.path.join(
+    os.path.dirname(__file__), "..", ".mvpxiv"
+)
+
+_VERSION_SUFFIX = re.compile(r"v\d+$")
+
+
+def base_arxiv_id(arxiv_id: str) -> str:
+    """Strip the version suffix: '2401.01234v2' → '2401.01234'."""
+    return _VERSION_SUFFIX.sub("", arxiv_id.strip())
+
+
+class IngestIndex:
+    """SQLite index of processed arXiv ids and per-category watermarks."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(STATE_DIR, "state.sqlite")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(
+            """
+            create table if not exists processed_papers (
+              arxiv_id     text primary key,
+              category     text not null,
+              published_at text not null,
+              batch_date   text not null,
+              processed_at text not null
+            );
+            create index if not exists idx_processed_category_published
+              on processed_papers(category, published_at);
+            """
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def seen_ids(self, exclude_batch: str | None = None) -> set[str]:
+        """
+        Base ids of every processed paper. Papers processed for
+        exclude_batch are left out so re-running a batch date sees them again.
+        """
+        rows = self._conn.execute(
+            "select arxiv_id from processed_papers where batch_date != ?",
+            (exclude_batch or "",),
+        )
+        return {r[0] for r in rows}
+
+    def watermarks(self, exclude_batch: str | None = None) -> dict[str, str]:
+        """Newest processed submission date (YYYY-MM-DD) per category."""
+        rows = self._conn.execute(
+            """
+            select category, max(published_at) from processed_papers
+            where batch_date != ? group by category
+            """,
+            (exclude_batch or "",),
+        )
+        return {cat: published for cat, published in rows}
+
+    def mark_processed(self, papers: Iterable, batch_date: str) -> int:
+        """Record ArxivPapers as processed for batch_date. Returns row count."""
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (
+                base_arxiv_id(p.arxiv_id),
+                p.query_category or p.primary_category,
+                p.published_at,
+                batch_date,
+                now,
+            )
+            for p in papers
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "insert or replace into processed_papers values (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
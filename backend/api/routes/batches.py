@@ -1,17 +1,26 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from typing import Literal
 
-from backend.api.schemas import (
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from common.schemas import (
     Batch,
     BatchWithIdeas,
+    BatchWithIdeaSummaries,
     row_to_batch,
     row_to_idea,
+    row_to_idea_summary,
 )
+from backend.cache import cached_response
 from backend.db.supabase import (
-    fetch_latest_batch_row,
-    fetch_all_batch_rows,
+    IDEA_COLUMNS,
+    IDEA_SUMMARY_COLUMNS,
+    fetch_latest_batch_with_ideas,
+    fetch_all_batch_rows_with_idea_ids,
     fetch_batch_row_by_date,
     fetch_ideas_by_batch,
 )
+from backend.snapshots import snapshot_response
 
 router = APIRouter(prefix="/api/batches", tags=["batches"])
 
@@ -22,38 +31,71 @@ def _enrich_batch_with_idea_ids(batch_row: dict, idea_rows: list[dict]) -> dict:
     return batch_row
 
 
-@router.get("/latest", response_model=BatchWithIdeas)
-async def get_latest_batch():
-    row = fetch_latest_batch_row()
-    if not row:
-        raise HTTPException(404, "No batches found")
-    idea_rows = fetch_ideas_by_batch(row["id"])
+View = Literal["full", "summary"]
+_VIEW_QUERY = Query(
+    "full",
+    description="'summary' returns card fields only; full detail stays at /api/ideas/{id}",
+)
+
+
+def _fetch_ideas(batch_date: str, view: View):
+    columns = IDEA_SUMMARY_COLUMNS if view == "summary" else IDEA_COLUMNS
+    return fetch_ideas_by_batch(batch_date, columns=columns)
+
+
+def _batch_with_ideas(
+    row: dict, idea_rows: list[dict], view: View
+) -> BatchWithIdeas | BatchWithIdeaSummaries:
     _enrich_batch_with_idea_ids(row, idea_rows)
+    if view == "summary":
+        return BatchWithIdeaSummaries(
+            batch=row_to_batch(row),
+            ideas=[row_to_idea_summary(r) for r in idea_rows],
+        )
     return BatchWithIdeas(
         batch=row_to_batch(row),
         ideas=[row_to_idea(r) for r in idea_rows],
     )
 
 
+@router.get("/latest", response_model=BatchWithIdeas | BatchWithIdeaSummaries)
+async def get_latest_batch(request: Request, view: View = _VIEW_QUERY):
+    if view == "full" and (snapshot := snapshot_response(request, "latest.json")):
+        return snapshot
+
+    async def build():
+        columns = IDEA_SUMMARY_COLUMNS if view == "summary" else IDEA_COLUMNS
+        row, idea_rows = await fetch_latest_batch_with_ideas(columns)
+        if not row:
+            raise HTTPException(404, "No batches found")
+        return _batch_with_ideas(row, idea_rows, view)
+
+    return await cached_response(f"batches:latest:{view}", build, request)
+
+
 @router.get("", response_model=list[Batch])
-async def list_batches():
-    rows = fetch_all_batch_rows()
-    result: list[Batch] = []
-    for row in rows:
-        idea_rows = fetch_ideas_by_batch(row["id"])
-        _enrich_batch_with_idea_ids(row, idea_rows)
-        result.append(row_to_batch(row))
-    return result
-
-
-@router.get("/{date}", response_model=BatchWithIdeas)
-async def get_batch_by_date(date: str):
-    row = fetch_batch_row_by_date(date)
-    if not row:
-        raise HTTPException(404, f"Batch not found: {date}")
-    idea_rows = fetch_ideas_by_batch(date)
-    _enrich_batch_with_idea_ids(row, idea_rows)
-    return BatchWithIdeas(
-        batch=row_to_batch(row),
-        ideas=[row_to_idea(r) for r in idea_rows],
-    )
+async def list_batches(request: Request):
+    if snapshot := snapshot_response(request, "batches/index.json"):
+        return snapshot
+
+    async def build():
+        return [row_to_batch(row) for row in await fetch_all_batch_rows_with_idea_ids()]
+
+    return await cached_response("batches:list", build, request)
+
+
+@router.get("/{date}", response_model=BatchWithIdeas | BatchWithIdeaSummaries)
+async def get_batch_by_date(request: Request, date: str, view: View = _VIEW_QUERY):
+    if view == "full" and (snapshot := snapshot_response(request, f"batches/{date}.json")):
+        return snapshot
+
+    async def build():
+        # The date is the batch id, so both queries can run at once.
+        row, idea_rows = await asyncio.gather(
+            fetch_batch_row_by_date(date), _fetch_ideas(date, view)
+        )
+        if not row:
+            raise HTTPException(404, f"Batch not found: {date}")
+        return _batch_with_ideas(row, idea_rows, view)
+
+    return await cached_response(f"batches:{date}:{view}", build, request)
@@ -0,0 +1,29 @@
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException
+
+from backend.cache import get_cache
+from backend.config import get_settings
+
+router = APIRouter(prefix="/api/cache", tags=["cache"])
+
+
+def _require_token(authorization: str) -> None:
+    """Both cache endpoints are operator-only: CACHE_INVALIDATE_TOKEN as a bearer token."""
+    token = get_settings().cache_invalidate_token
+    if not token:
+        raise HTTPException(404, "Cache admin endpoints are not enabled")
+    if not hmac.compare_digest(authorization, f"Bearer {token}"):
+        raise HTTPException(401, "Invalid token")
+
+
+@router.get("/stats")
+async def cache_stats(authorization: str = Header("")):
+    _require_token(authorization)
+    return get_cache().stats()
+
+
+@router.post("/invalidate", status_code=204)
+async def invalidate_cache(authorization: str = Header("")):
+    _require_token(authorization)
+    get_cache().invalidate("signal from pipeline")
@@ -1,14 +1,111 @@
-from fastapi import APIRouter, HTTPException
+import base64
+import binascii
+import uuid
+from datetime import date, datetime
+from typing import Literal
 
-from backend.api.schemas import Idea, row_to_idea
-from backend.db.supabase import fetch_idea_row_by_id
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from common.schemas import (
+    Idea,
+    IdeaCategory,
+    IdeaPage,
+    IdeaSummaryPage,
+    SimilarIdea,
+    row_to_idea,
+    row_to_idea_summary,
+    row_to_similar_idea,
+)
+from backend.cache import cached_response
+from backend.db.supabase import (
+    IDEA_COLUMNS,
+    IDEA_SUMMARY_COLUMNS,
+    fetch_idea_page,
+    fetch_idea_row_by_id,
+    fetch_similar_idea_rows,
+)
+from backend.snapshots import snapshot_response
 
 router = APIRouter(prefix="/api/ideas", tags=["ideas"])
 
+MAX_PAGE_SIZE = 100
+
+
+def _encode_cursor(row: dict) -> str:
+    raw = f"{row['created_at']}|{row['id']}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    """Opaque cursor → (created_at, id) of the last idea on the previous page."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, idea_id = raw.split("|")
+        datetime.fromisoformat(created_at)
+        uuid.UUID(idea_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(400, "Invalid cursor")
+    return created_at, idea_id
+
+
+@router.get("", response_model=IdeaSummaryPage | IdeaPage)
+async def list_ideas(
+    request: Request,
+    category: IdeaCategory | None = None,
+    date_from: date | None = Query(None, alias="from", description="First batch date (inclusive)"),
+    date_to: date | None = Query(None, alias="to", description="Last batch date (inclusive)"),
+    min_score: int | None = Query(None, ge=0, le=40, description="Minimum total rubric score (0-40)"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="nextCursor from the previous page"),
+    view: Literal["full", "summary"] = "summary",
+):
+    """Ideas across all batches, newest first, one keyset page at a time."""
+    after = _decode_cursor(cursor) if cursor else None
+
+    async def build():
+        # One extra row tells us whether another page exists.
+        rows = await fetch_idea_page(
+            limit + 1,
+            after=after,
+            category=category.value if category else None,
+            date_from=date_from.isoformat() if date_from else None,
+            date_to=date_to.isoformat() if date_to else None,
+            min_score=min_score,
+            columns=IDEA_SUMMARY_COLUMNS if view == "summary" else IDEA_COLUMNS,
+        )
+        next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        rows = rows[:limit]
+        if view == "summary":
+            return IdeaSummaryPage(items=[row_to_idea_summary(r) for r in rows], nextCursor=next_cursor)
+        return IdeaPage(items=[row_to_idea(r) for r in rows], nextCursor=next_cursor)
+
+    key = f"ideas:list:{category and category.value}:{date_from}:{date_to}:{min_score}:{limit}:{cursor}:{view}"
+    return await cached_response(key, build, request)
+
 
 @router.get("/{idea_id}", response_model=Idea)
-async def get_idea(idea_id: str):
-    row = fetch_idea_row_by_id(idea_id)
-    if not row:
+async def get_idea(request: Request, idea_id: str):
+    if snapshot := snapshot_response(request, f"ideas/{idea_id}.json"):
+        return snapshot
+
+    async def build():
+        row = await fetch_idea_row_by_id(idea_id)
+        if not row:
+            raise HTTPException(404, f"Idea not found: {idea_id}")
+        return row_to_idea(row)
+
+    return await cached_response(f"ideas:{idea_id}", build, request)
+
+
+@router.get("/{idea_id}/similar", response_model=list[SimilarIdea])
+async def get_similar_ideas(request: Request, idea_id: str):
+    """Related ideas from other batches, precomputed by the daily pipeline."""
+    try:
+        uuid.UUID(idea_id)
+    except ValueError:
         raise HTTPException(404, f"Idea not found: {idea_id}")
-    return row_to_idea(row)
+
+    async def build():
+        return [row_to_similar_idea(r) for r in await fetch_similar_idea_rows(idea_id)]
+
+    return await cached_response(f"ideas:{idea_id}:similar", build, request)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Query, Request
+
+from common.schemas import SearchResults, row_to_search_hit
+from backend.cache import cached_response
+from backend.db.supabase import search_ideas
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+MAX_PAGE_SIZE = 50
+MAX_QUERY_LENGTH = 200
+
+
+@router.get("", response_model=SearchResults)
+async def search(
+    request: Request,
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=MAX_QUERY_LENGTH,
+        description='Web-search syntax: words, "quoted phrases", OR, -excluded',
+    ),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Ranked full-text search over startup name, paper title, tech stack,
+    value proposition and technical core. Each hit carries a `headline`
+    with matches wrapped in <mark>.
+    """
+    q = " ".join(q.split())
+
+    async def build():
+        # One extra row tells us whether another page exists.
+        rows = await search_ideas(q, limit + 1, offset)
+        return SearchResults(
+            items=[row_to_search_hit(r) for r in rows[:limit]],
+            nextOffset=offset + limit if len(rows) > limit else None,
+        )
+
+    return await cached_response(f"search:{q.lower()}:{limit}:{offset}", build, request)
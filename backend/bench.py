@@ -0,0 +1,71 @@
+"""
+Concurrent load benchmark for the read API.
+
+Fires `--requests` GETs at each path with `--concurrency` in flight and
+reports throughput and latency percentiles. Run the API with
+CACHE_MAX_ENTRIES=0 to measure the database path rather than the cache.
+
+Usage:
+  uvicorn backend.main:app --port 8000 &
+  python -m backend.bench --url http://localhost:8000 \\
+      --path /api/batches/latest --path /api/batches --concurrency 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run(url: str, path: str, total: int, concurrency: int) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async with httpx.AsyncClient(base_url=url, timeout=60.0) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(path)
+                    resp.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MVPXiv API load benchmark")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", help="Path to hit (repeatable)")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    for path in args.path or ["/api/batches/latest"]:
+        r = asyncio.run(run(args.url, path, args.requests, args.concurrency))
+        print(
+            f"{path:<32} {r['rps']:8.1f} req/s   p50 {r['p50_ms']:7.1f} ms   "
+            f"p95 {r['p95_ms']:7.1f} ms   errors {r['errors']}"
+        )
@@ -0,0 +1,179 @@
+"""
+In-process response cache for the read API.
+
+Serialized JSON responses are kept in a bounded LRU with a TTL. Batches
+only change when the daily pipeline persists, so the whole cache is
+dropped when the data version (latest batch id + created_at) changes.
+The version is re-checked at most every `version_check_seconds`, keeping
+the hot path a memory lookup; run_daily can also invalidate immediately
+via POST /api/cache/invalidate. Concurrent misses for the same key share
+one build instead of all hitting the database.
+
+Each entry carries a content-hash ETag (If-None-Match → 304) and its
+gzip/brotli encodings, built on first use and kept with the entry.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from backend.config import get_settings
+from backend.db.supabase import fetch_data_version
+from backend.encoding import encoded_etag, etag_matches, negotiate
+from common.encoding import compress, content_hash
+
+
+class CachedBody:
+    """A serialized response body, its ETag and lazily built encodings."""
+
+    __slots__ = ("body", "etag", "_encoded")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = content_hash(body)
+        self._encoded: dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compress(self.body, encoding)
+        return self._encoded[encoding]
+
+
+class ApiCache:
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600.0,
+        version_check_seconds: float = 30.0,
+        version_fn: Callable[[], Awaitable[str | None]] | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self.version_fn = version_fn
+        self.version: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, tuple[float, CachedBody]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[CachedBody]] = {}
+        self._next_version_check = 0.0
+
+    async def get_or_build(self, key: str, build: Callable[[], Awaitable[Any]]) -> tuple[CachedBody, bool]:
+        """
+        Return (cached body, hit). On a miss, `await build()` produces
+        the response object; exceptions (e.g. 404s) propagate and are not cached.
+        """
+        await self._check_version()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], True
+        self.misses += 1
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending), False
+        future: asyncio.Future[CachedBody] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self.invalidations
+        try:
+            body = CachedBody(json.dumps(jsonable_encoder(await build()), separators=(",", ":")).encode())
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._inflight[key]
+        future.set_result(body)
+
+        if generation != self.invalidations:
+            return body, False  # built from pre-invalidation data; don't keep it
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return body, False
+
+    def invalidate(self, reason: str = "manual") -> None:
+        self._entries.clear()
+        self.invalidations += 1
+        self._next_version_check = 0.0
+        print(f"[cache] Invalidated ({reason})")
+
+    async def _check_version(self) -> None:
+        if self.version_fn is None or time.monotonic() < self._next_version_check:
+            return
+        self._next_version_check = time.monotonic() + self.version_check_seconds
+        try:
+            version = await self.version_fn()
+        except Exception as e:
+            print(f"[cache] Version check failed: {e}")
+            return
+        if version != self.version:
+            if self.version is not None:
+                self.invalidate(f"data version {self.version} → {version}")
+            self.version = version
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / total, 3) if total else None,
+            "invalidations": self.invalidations,
+            "version": self.version,
+        }
+
+
+@lru_cache()
+def get_cache() -> ApiCache:
+    s = get_settings()
+    return ApiCache(
+        max_entries=s.cache_max_entries,
+        ttl_seconds=s.cache_ttl_seconds,
+        version_check_seconds=s.cache_version_check_seconds,
+        version_fn=fetch_data_version,
+    )
+
+
+async def cached_response(
+    key: str, build: Callable[[], Awaitable[Any]], request: Request | None = None
+) -> Response:
+    """
+    JSON Response for `key`, served from the cache when possible. With the
+    request, answers 304 to a matching If-None-Match and compresses bodies
+    of at least compression_min_bytes when the client accepts it.
+    """
+    entry, hit = await get_cache().get_or_build(key, build)
+    encoding = None
+    if request is not None and len(entry.body) >= get_settings().compression_min_bytes:
+        encoding = negotiate(request.headers.get("accept-encoding"))
+    etag = encoded_etag(entry.etag, encoding)
+    headers = {
+        "X-Cache": "HIT" if hit else "MISS",
+        "ETag": f'"{etag}"',
+        "Vary": "Accept-Encoding",
+    }
+    # The 304 carries the same tag the 200 would; the bare content hash
+    # (identity representation) is accepted too.
+    if request is not None and etag_matches(request.headers.get("if-none-match"), etag, entry.etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        return Response(content=entry.encoded(encoding), media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -7,6 +7,19 @@ class Settings(BaseSettings):
     supabase_service_role_key: str
     openrouter_api_key: str = ""
 
+    # In-process response cache (backend/cache.py)
+    cache_max_entries: int = 256
+    cache_ttl_seconds: float = 3600.0
+    cache_version_check_seconds: float = 30.0
+    # Shared secret for POST /api/cache/invalidate; empty disables the endpoint.
+    cache_invalidate_token: str = ""
+    # Responses smaller than this are sent uncompressed.
+    compression_min_bytes: int = 1024
+
+    # Static snapshots from automation/snapshots.py; empty = always query Supabase.
+    snapshot_dir: str = ""
+    snapshot_max_age: int = 300
+
     class Config:
         env_file = os.path.join(os.path.dirname(__file__), "..", ".env")
         env_file_encoding = "utf-8"
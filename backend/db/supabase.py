@@ -1,27 +1,42 @@
-"""Supabase client + query functions for batches and ideas."""
+"""
+Supabase client + query functions for batches and ideas.
+
+Reads are async (one shared AsyncClient) so API routes never block the
+event loop. The API is read-only; batches are written by the automation
+pipeline through the replace_batch database function.
+"""
 
 from __future__ import annotations
 
-from functools import lru_cache
-from supabase import create_client, Client
+import asyncio
+from supabase import AsyncClient, acreate_client
 
 from backend.config import get_settings
+from common.schemas import IDEA_COLUMNS, IDEA_SUMMARY_COLUMNS
+
+_async_client: AsyncClient | None = None
+_async_client_lock = asyncio.Lock()
 
 
-@lru_cache()
-def get_client() -> Client:
-    s = get_settings()
-    return create_client(s.supabase_url, s.supabase_service_role_key)
+async def get_async_client() -> AsyncClient:
+    global _async_client
+    if _async_client is None:
+        async with _async_client_lock:
+            if _async_client is None:
+                s = get_settings()
+                _async_client = await acreate_client(s.supabase_url, s.supabase_service_role_key)
+    return _async_client
 
 
 # ── Batches ──────────────────────────────────────────────
 
-def fetch_latest_batch_row() -> dict | None:
+async def fetch_latest_batch_row(columns: str = "*") -> dict | None:
     """Return the most recent batch row, or None."""
-    resp = (
-        get_client()
+    client = await get_async_client()
+    resp = await (
+        client
         .table("batches")
-        .select("*")
+        .select(columns)
         .order("date", desc=True)
         .limit(1)
         .execute()
@@ -29,10 +44,42 @@ def fetch_latest_batch_row() -> dict | None:
     return resp.data[0] if resp.data else None
 
 
-def fetch_all_batch_rows() -> list[dict]:
+async def fetch_latest_batch_with_ideas(idea_columns: str = IDEA_COLUMNS) -> tuple[dict | None, list[dict]]:
+    """
+    Return (latest batch row, its idea rows) in one round trip, embedding
+    ideas through the ideas.batch_date foreign key.
+    """
+    client = await get_async_client()
+    resp = await (
+        client
+        .table("batches")
+        .select(f"*, ideas({idea_columns})")
+        .order("date", desc=True)
+        .limit(1)
+        .execute()
+    )
+    if not resp.data:
+        return None, []
+    row = resp.data[0]
+    ideas = row.pop("ideas", None) or []
+    ideas.sort(key=lambda r: r.get("created_at") or "")
+    return row, ideas
+
+
+async def fetch_data_version() -> str | None:
+    """
+    Cheap marker that changes whenever a batch is (re)written: the latest
+    batch id plus its created_at (replace_batch re-inserts the row).
+    """
+    row = await fetch_latest_batch_row(columns="id,created_at")
+    return f"{row['id']}@{row['created_at']}" if row else None
+
+
+async def fetch_all_batch_rows() -> list[dict]:
     """Return all batches ordered newest-first."""
-    resp = (
-        get_client()
+    client = await get_async_client()
+    resp = await (
+        client
         .table("batches")
         .select("*")
         .order("date", desc=True)
@@ -41,10 +88,31 @@ def fetch_all_batch_rows() -> list[dict]:
     return resp.data or []
 
 
-def fetch_batch_row_by_date(date_str: str) -> dict | None:
+async def fetch_all_batch_rows_with_idea_ids() -> list[dict]:
+    """
+    Return all batches newest-first, each with an `idea_ids` list.
+    One round trip: ideas are embedded via the ideas.batch_date foreign key
+    and only their ids are selected.
+    """
+    client = await get_async_client()
+    resp = await (
+        client
+        .table("batches")
+        .select("*, ideas(id)")
+        .order("date", desc=True)
+        .execute()
+    )
+    rows = resp.data or []
+    for row in rows:
+        row["idea_ids"] = [str(i["id"]) for i in row.pop("ideas", None) or []]
+    return rows
+
+
+async def fetch_batch_row_by_date(date_str: str) -> dict | None:
     """Return a single batch by its id (YYYY-MM-DD), or None."""
-    resp = (
-        get_client()
+    client = await get_async_client()
+    resp = await (
+        client
         .table("batches")
         .select("*")
         .eq("id", date_str)
@@ -56,12 +124,13 @@ def fetch_batch_row_by_date(date_str: str) -> dict | None:
 
 # ── Ideas ────────────────────────────────────────────────
 
-def fetch_ideas_by_batch(batch_date: str) -> list[dict]:
-    """Return all ideas for a given batch date."""
-    resp = (
-        get_client()
+async def fetch_ideas_by_batch(batch_date: str, columns: str = IDEA_COLUMNS) -> list[dict]:
+    """Return all ideas for a given batch date (optionally projected to `columns`)."""
+    client = await get_async_client()
+    resp = await (
+        client
         .table("ideas")
-        .select("*")
+        .select(columns)
         .eq("batch_date", batch_date)
         .order("created_at", desc=False)
         .execute()
@@ -69,12 +138,56 @@ def fetch_ideas_by_batch(batch_date: str) -> list[dict]:
     return resp.data or []
 
 
-def fetch_idea_row_by_id(idea_id: str) -> dict | None:
+async def fetch_idea_page(
+    limit: int,
+    after: tuple[str, str] | None = None,
+    category: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    min_score: int | None = None,
+    columns: str = IDEA_COLUMNS,
+) -> list[dict]:
+    """
+    Return up to `limit` ideas newest-first by (created_at, id), starting
+    strictly after the `after` cursor. Keyset rather than offset: the
+    `created_at <= cursor` conjunct gives Postgres an index bound on
+    idx_ideas_(category_)created_id, so the scan starts at the cursor and
+    deep pages cost the same as the first. The OR only breaks ties on id
+    among rows sharing the cursor's created_at.
+    """
+    client = await get_async_client()
+    query = client.table("ideas").select(columns)
+    if category:
+        query = query.eq("category", category)
+    if date_from:
+        query = query.gte("batch_date", date_from)
+    if date_to:
+        query = query.lte("batch_date", date_to)
+    if min_score is not None:
+        query = query.gte("score_total", min_score)
+    if after:
+        created_at, idea_id = after
+        query = query.lte("created_at", created_at).or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.lt.{idea_id})'
+        )
+    resp = await (
+        query
+        .order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(limit)
+        .execute()
+    )
+    return resp.data or []
+
+
+async def fetch_idea_row_by_id(idea_id: str) -> dict | None:
     """Return a single idea by UUID, or None."""
-    resp = (
-        get_client()
+    client = await get_async_client()
+    resp = await (
+        client
         .table("ideas")
-        .select("*")
+        .select(IDEA_COLUMNS)
         .eq("id", idea_id)
         .limit(1)
         .execute()
@@ -82,22 +195,36 @@ def fetch_idea_row_by_id(idea_id: str) -> dict | None:
     return resp.data[0] if resp.data else None
 
 
-# ── Writes (used by automation pipeline) ─────────────────
-
-def upsert_batch(row: dict) -> dict:
-    """Insert or update a batch row."""
-    resp = get_client().table("batches").upsert(row).execute()
-    return resp.data[0] if resp.data else row
-
-
-def insert_ideas(rows: list[dict]) -> list[dict]:
-    """Bulk-insert idea rows."""
-    if not rows:
-        return []
-    resp = get_client().table("ideas").insert(rows).execute()
+async def fetch_similar_idea_rows(idea_id: str, columns: str = IDEA_SUMMARY_COLUMNS) -> list[dict]:
+    """
+    Return the precomputed neighbours of an idea, most similar first: one
+    idea_neighbors primary-key range scan with the neighbour rows embedded.
+    Each row carries `similarity`.
+    """
+    client = await get_async_client()
+    resp = await (
+        client
+        .table("idea_neighbors")
+        .select(f"similarity, neighbor:ideas!neighbor_id({columns})")
+        .eq("idea_id", idea_id)
+        .order("rank")
+        .execute()
+    )
+    return [
+        {**r["neighbor"], "similarity": r["similarity"]}
+        for r in resp.data or []
+        if r.get("neighbor")
+    ]
+
+
+async def search_ideas(query: str, limit: int, offset: int = 0) -> list[dict]:
+    """
+    Ranked full-text search (search_ideas RPC): summary columns plus
+    `rank` and a highlighted `headline`, best match first.
+    """
+    client = await get_async_client()
+    resp = await client.rpc(
+        "search_ideas", {"query": query, "max_results": limit, "skip": offset}
+    ).execute()
     return resp.data or []
 
-
-def delete_ideas_for_batch(batch_date: str) -> None:
-    """Delete all ideas for a batch (used before re-inserting)."""
-    get_client().table("ideas").delete().eq("batch_date", batch_date).execute()
@@ -0,0 +1,51 @@
+"""
+HTTP representation helpers: ETag matching and content negotiation over
+the encodings common.encoding can produce.
+"""
+
+from __future__ import annotations
+
+from common.encoding import ENCODINGS
+
+
+def etag_matches(if_none_match: str | None, *tags: str) -> bool:
+    """
+    Whether an If-None-Match header lists any of `tags` (opaque tags without
+    quotes, compared weakly so a W/ prefix added by a proxy still matches).
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.removeprefix("W/").strip('"') in tags:
+            return True
+    return False
+
+
+def encoded_etag(digest: str, encoding: str | None) -> str:
+    """Opaque tag of one representation: the content hash, suffixed per encoding."""
+    return f"{digest}-{encoding}" if encoding else digest
+
+
+def accepted_encodings(accept_encoding: str | None) -> list[str]:
+    """ENCODINGS the Accept-Encoding header allows, most preferred first."""
+    accepted: dict[str, float] = {}
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    wildcard = accepted.get("*", 0.0)
+    return [e for e in ENCODINGS if accepted.get(e, wildcard) > 0]
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Pick "br" or "gzip" from an Accept-Encoding header, or None for identity."""
+    encodings = accepted_encodings(accept_encoding)
+    return encodings[0] if encodings else None
@@ -2,9 +2,13 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from backend.api.routes.batches import router as batches_router
+from backend.api.routes.cache import router as cache_router
 from backend.api.routes.ideas import router as ideas_router
+from backend.api.routes.search import router as search_router
+from backend.config import get_settings
 
 app = FastAPI(
     title="MVPXiv API",
@@ -18,10 +22,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Cache"],
 )
+# Cached API responses arrive precompressed (br/gzip, see backend/cache.py);
+# this covers everything else, e.g. snapshot files. Already-encoded
+# responses pass through untouched.
+app.add_middleware(GZipMiddleware, minimum_size=get_settings().compression_min_bytes)
 
 app.include_router(batches_router)
 app.include_router(ideas_router)
+app.include_router(search_router)
+app.include_router(cache_router)
 
 
 @app.get("/health")
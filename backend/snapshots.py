@@ -0,0 +1,90 @@
+"""
+Serve the static JSON snapshots written by automation/snapshots.py.
+
+With SNAPSHOT_DIR set, the full-detail batch and idea routes answer from
+disk instead of Supabase. The content hashes in manifest.json are strong
+ETags, so a matching If-None-Match gets a 304 without reading the file.
+The manifest is reloaded whenever its mtime changes; paths missing from
+it (and other views) fall through to the live query. The exporter
+stores .br/.gz copies next to each file; those are sent as-is with a
+per-encoding ETag, so the gzip middleware never recompresses a snapshot.
+A client whose accepted encoding has no copy on disk gets the live path.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from functools import lru_cache
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+from backend.config import get_settings
+from backend.encoding import accepted_encodings, encoded_etag, etag_matches
+from common.encoding import FILE_SUFFIXES
+
+MANIFEST = "manifest.json"
+
+
+class SnapshotStore:
+    def __init__(self, root: str, max_age: int = 300):
+        self.root = root
+        self.max_age = max_age
+        self._files: dict[str, str] = {}
+        self._mtime_ns = 0
+
+    def _manifest(self) -> dict[str, str]:
+        try:
+            mtime_ns = os.stat(os.path.join(self.root, MANIFEST)).st_mtime_ns
+        except FileNotFoundError:
+            self._files, self._mtime_ns = {}, 0
+            return self._files
+        if mtime_ns != self._mtime_ns:
+            try:
+                with open(os.path.join(self.root, MANIFEST)) as f:
+                    self._files = json.load(f).get("files", {})
+                self._mtime_ns = mtime_ns
+            except (OSError, ValueError) as e:
+                print(f"[snapshots] Could not load manifest: {e}")
+        return self._files
+
+    def response(self, request: Request, rel: str) -> Response | None:
+        """Snapshot response for `rel`, a 304, or None when there is no snapshot."""
+        digest = self._manifest().get(rel)
+        if digest is None:
+            return None
+        path = os.path.join(self.root, rel)
+        encodings = accepted_encodings(request.headers.get("accept-encoding"))
+        encoding = next((e for e in encodings if os.path.isfile(path + FILE_SUFFIXES[e])), None)
+        if encoding is None and encodings:
+            return None
+        etag = encoded_etag(digest, encoding)
+        headers = {
+            "ETag": f'"{etag}"',
+            "Cache-Control": f"public, max-age={self.max_age}",
+            "Vary": "Accept-Encoding",
+            "X-Cache": "SNAPSHOT",
+        }
+        if etag_matches(request.headers.get("if-none-match"), etag, digest):
+            return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            path += FILE_SUFFIXES[encoding]
+        elif not os.path.isfile(path):
+            return None
+        return FileResponse(path, media_type="application/json", headers=headers)
+
+
+@lru_cache()
+def get_snapshot_store() -> SnapshotStore | None:
+    s = get_settings()
+    if not s.snapshot_dir:
+        return None
+    print(f"[snapshots] Serving snapshots from {s.snapshot_dir}")
+    return SnapshotStore(s.snapshot_dir, s.snapshot_max_age)
+
+
+def snapshot_response(request: Request, rel: str) -> Response | None:
+    store = get_snapshot_store()
+    return store.response(request, rel) if store else None
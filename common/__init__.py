@@ -0,0 +1,4 @@
+"""
+Code shared by the read API (backend/) and the daily pipeline
+(automation/). Imports neither, so the pipeline doesn't need FastAPI.
+"""
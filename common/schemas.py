@@ -0,0 +1,253 @@
+"""Pydantic models — match TypeScript types + Supabase schema."""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+# Every idea column except the generated search_vector and score_total,
+# which only the database uses (search, min_score filter). Explicit rather
+# than "*" so full-detail reads don't ship the stored tsvector.
+IDEA_COLUMNS = (
+    "id,batch_date,category,startup_name,value_proposition,technical_core,"
+    "implementation,tech_stack,resume_bullets,why_this_paper,"
+    "score_demand_urgency,score_pricing_power,score_distribution_ease,score_speed_to_mvp,"
+    "paper_title,paper_url,paper_authors,paper_abstract,paper_arxiv_id,"
+    "paper_published_at,paper_primary_category,created_at"
+)
+
+# Columns behind IdeaSummary: everything a card needs, none of the long text.
+IDEA_SUMMARY_COLUMNS = (
+    "id,batch_date,category,startup_name,value_proposition,why_this_paper,"
+    "tech_stack,paper_title,paper_url,paper_arxiv_id,paper_primary_category,created_at"
+)
+
+
+class IdeaCategory(str, Enum):
+    BACKLOG = "BACKLOG"
+    CONSIDERABLE = "CONSIDERABLE"
+    PROMISING = "PROMISING"
+    LUCRATIVE = "LUCRATIVE"
+
+
+class Paper(BaseModel):
+    title: str
+    url: str
+    authors: list[str] | None = None
+    abstract: str | None = None
+    arxiv_id: str | None = Field(None, alias="arxivId")
+    published_at: str | None = Field(None, alias="publishedAt")
+    primary_category: str | None = Field(None, alias="primaryCategory")
+
+    class Config:
+        populate_by_name = True
+
+
+class PaperSummary(BaseModel):
+    title: str
+    url: str
+    arxiv_id: str | None = Field(None, alias="arxivId")
+    primary_category: str | None = Field(None, alias="primaryCategory")
+
+    class Config:
+        populate_by_name = True
+
+
+class CountsByCategory(BaseModel):
+    backlog: int = 0
+    considerable: int = 0
+    promising: int = 0
+    lucrative: int = 0
+
+
+class Idea(BaseModel):
+    id: str
+    batch_date: str = Field(alias="batchDate")
+    category: IdeaCategory
+    startup_name: str = Field(alias="startupName")
+    value_proposition: str = Field(alias="valueProposition")
+    technical_core: str = Field(alias="technicalCore")
+    implementation: str
+    tech_stack: list[str] = Field(alias="techStack")
+    resume_bullets: tuple[str, str, str] = Field(alias="resumeBullets")
+    why_this_paper: str = Field(alias="whyThisPaper")
+    paper: Paper
+    created_at: str = Field(alias="createdAt")
+
+    class Config:
+        populate_by_name = True
+
+    @field_validator("tech_stack")
+    @classmethod
+    def tech_stack_size(cls, v: list[str]) -> list[str]:
+        if not (5 <= len(v) <= 12):
+            raise ValueError("techStack must have 5–12 items")
+        return v
+
+
+class IdeaSummary(BaseModel):
+    """Card-sized idea: no implementation, technical core or abstract."""
+
+    id: str
+    batch_date: str = Field(alias="batchDate")
+    category: IdeaCategory
+    startup_name: str = Field(alias="startupName")
+    value_proposition: str = Field(alias="valueProposition")
+    why_this_paper: str = Field(alias="whyThisPaper")
+    tech_stack: list[str] = Field(alias="techStack")
+    paper: PaperSummary
+    created_at: str = Field(alias="createdAt")
+
+    class Config:
+        populate_by_name = True
+
+
+class SearchHit(IdeaSummary):
+    """IdeaSummary plus search rank and a <mark>-highlighted snippet."""
+
+    rank: float
+    headline: str
+
+
+class SimilarIdea(IdeaSummary):
+    """IdeaSummary plus cosine similarity to the requested idea (0–1)."""
+
+    similarity: float
+
+
+class SearchResults(BaseModel):
+    items: list[SearchHit]
+    next_offset: int | None = Field(None, alias="nextOffset")
+
+    class Config:
+        populate_by_name = True
+
+
+class Batch(BaseModel):
+    id: str
+    date: str
+    created_at: str = Field(alias="createdAt")
+    sources: list[str]
+    research_themes: list[str] = Field(alias="researchThemes")
+    counts_by_category: CountsByCategory = Field(alias="countsByCategory")
+    idea_ids: list[str] = Field(alias="ideaIds")
+
+    class Config:
+        populate_by_name = True
+
+
+class BatchWithIdeas(BaseModel):
+    batch: Batch
+    ideas: list[Idea]
+
+
+class BatchWithIdeaSummaries(BaseModel):
+    batch: Batch
+    ideas: list[IdeaSummary]
+
+
+class IdeaPage(BaseModel):
+    items: list[Idea]
+    next_cursor: str | None = Field(None, alias="nextCursor")
+
+    class Config:
+        populate_by_name = True
+
+
+class IdeaSummaryPage(BaseModel):
+    items: list[IdeaSummary]
+    next_cursor: str | None = Field(None, alias="nextCursor")
+
+    class Config:
+        populate_by_name = True
+
+
+# --- DB row → API model helpers ---
+
+def row_to_batch(row: dict) -> Batch:
+    """Convert a Supabase batches row into a Batch API model."""
+    idea_ids: list[str] = row.get("idea_ids", []) or []
+    return Batch(
+        id=row["id"],
+        date=row["id"],
+        createdAt=row["created_at"],
+        sources=row.get("sources", ["cs.LG", "cs.MA"]),
+        researchThemes=row.get("research_themes", []),
+        countsByCategory=CountsByCategory(
+            backlog=row.get("counts_backlog", 0),
+            considerable=row.get("counts_considerable", 0),
+            promising=row.get("counts_promising", 0),
+            lucrative=row.get("counts_lucrative", 0),
+        ),
+        ideaIds=idea_ids,
+    )
+
+
+def row_to_idea(row: dict) -> Idea:
+    """Convert a Supabase ideas row into an Idea API model."""
+    return Idea(
+        id=str(row["id"]),
+        batchDate=row["batch_date"],
+        category=row["category"],
+        startupName=row["startup_name"],
+        valueProposition=row["value_proposition"],
+        technicalCore=row["technical_core"],
+        implementation=row["implementation"],
+        techStack=row.get("tech_stack", []),
+        resumeBullets=tuple(row.get("resume_bullets", ["", "", ""])),
+        whyThisPaper=row["why_this_paper"],
+        paper=Paper(
+            title=row["paper_title"],
+            url=row["paper_url"],
+            authors=row.get("paper_authors"),
+            abstract=row.get("paper_abstract"),
+            arxivId=row.get("paper_arxiv_id"),
+            publishedAt=row.get("paper_published_at"),
+            primaryCategory=row.get("paper_primary_category"),
+        ),
+        createdAt=row["created_at"],
+    )
+
+
+def row_to_idea_summary(row: dict, model: type[IdeaSummary] = IdeaSummary, **extra) -> IdeaSummary:
+    """Convert a (summary-projected) ideas row into an IdeaSummary API model."""
+    return model(
+        id=str(row["id"]),
+        batchDate=row["batch_date"],
+        category=row["category"],
+        startupName=row["startup_name"],
+        valueProposition=row["value_proposition"],
+        whyThisPaper=row["why_this_paper"],
+        techStack=row.get("tech_stack", []),
+        paper=PaperSummary(
+            title=row["paper_title"],
+            url=row["paper_url"],
+            arxivId=row.get("paper_arxiv_id"),
+            primaryCategory=row.get("paper_primary_category"),
+        ),
+        createdAt=row["created_at"],
+        **extra,
+    )
+
+
+def row_to_search_hit(row: dict) -> SearchHit:
+    """Convert a search_ideas RPC row into a SearchHit API model."""
+    return row_to_idea_summary(row, SearchHit, rank=row["rank"], headline=row.get("headline") or "")
+
+
+def row_to_similar_idea(row: dict) -> SimilarIdea:
+    """Convert a neighbour row (summary columns + similarity) into a SimilarIdea."""
+    return row_to_idea_summary(row, SimilarIdea, similarity=row["similarity"])
+
+
+def dump_json(obj: Any) -> bytes:
+    """Serialize API models byte-for-byte the way the backend's response cache does."""
+    if isinstance(obj, BaseModel):
+        obj = obj.model_dump(mode="json", by_alias=True)
+    elif isinstance(obj, list):
+        obj = [o.model_dump(mode="json", by_alias=True) if isinstance(o, BaseModel) else o for o in obj]
+    return json.dumps(obj, separators=(",", ":")).encode()
@@ -0,0 +1,60 @@
+-- ============================================
+-- Migration: replace_batch (atomic batch write)
+-- For databases created from an older schema.sql; fresh installs
+-- already have this. Idempotent, safe to re-run.
+-- ============================================
+create or replace function replace_batch(batch jsonb, ideas jsonb)
+returns jsonb
+language plpgsql
+as $$
+declare
+  batch_id text := replace_batch.batch->>'id';
+  inserted int;
+begin
+  if batch_id is null then
+    raise exception 'replace_batch: batch.id is required';
+  end if;
+
+  -- ideas go with the batch via on delete cascade
+  delete from batches where id = batch_id;
+
+  insert into batches (
+    id, date, sources, research_themes,
+    counts_backlog, counts_considerable, counts_promising, counts_lucrative
+  )
+  select
+    batch_id,
+    coalesce(b.date, batch_id::date),
+    coalesce(b.sources, '{"cs.LG","cs.MA"}'),
+    b.research_themes,
+    coalesce(b.counts_backlog, 0),
+    coalesce(b.counts_considerable, 0),
+    coalesce(b.counts_promising, 0),
+    coalesce(b.counts_lucrative, 0)
+  from jsonb_populate_record(null::batches, replace_batch.batch) b;
+
+  insert into ideas (
+    id, batch_date, category, startup_name, value_proposition, technical_core,
+    implementation, tech_stack, resume_bullets, why_this_paper,
+    score_demand_urgency, score_pricing_power, score_distribution_ease, score_speed_to_mvp,
+    paper_title, paper_url, paper_authors, paper_abstract, paper_arxiv_id,
+    paper_published_at, paper_primary_category
+  )
+  select
+    coalesce(i.id, gen_random_uuid()), batch_id, i.category, i.startup_name,
+    i.value_proposition, i.technical_core, i.implementation, i.tech_stack,
+    i.resume_bullets, i.why_this_paper,
+    coalesce(i.score_demand_urgency, 0), coalesce(i.score_pricing_power, 0),
+    coalesce(i.score_distribution_ease, 0), coalesce(i.score_speed_to_mvp, 0),
+    i.paper_title, i.paper_url, i.paper_authors, i.paper_abstract, i.paper_arxiv_id,
+    i.paper_published_at, i.paper_primary_category
+  from jsonb_populate_recordset(null::ideas, coalesce(replace_batch.ideas, '[]'::jsonb)) i;
+  get diagnostics inserted = row_count;
+
+  return jsonb_build_object('batch', batch_id, 'ideas', inserted);
+end;
+$$;
+
+-- Writes are for the pipeline only (service role).
+revoke execute on function replace_batch(jsonb, jsonb) from public, anon, authenticated;
+grant execute on function replace_batch(jsonb, jsonb) to service_role;
@@ -0,0 +1,17 @@
+-- ============================================
+-- Migration: keyset pagination for GET /api/ideas
+-- For databases created from an older schema.sql; fresh installs
+-- already have this. Idempotent, safe to re-run.
+-- ============================================
+
+-- Rubric total for the min_score filter (adding a stored column
+-- rewrites the table once).
+alter table ideas add column if not exists score_total int generated always as (
+  score_demand_urgency + score_pricing_power + score_distribution_ease + score_speed_to_mvp
+) stored;
+
+-- (created_at, id) newest-first, optionally within one category. The old
+-- created_at-only index is a prefix of idx_ideas_created_id.
+drop index if exists idx_ideas_created_at;
+create index if not exists idx_ideas_created_id          on ideas(created_at desc, id desc);
+create index if not exists idx_ideas_category_created_id on ideas(category, created_at desc, id desc);
@@ -0,0 +1,69 @@
+-- ============================================
+-- Migration: full-text search over ideas
+-- For databases created from an older schema.sql; fresh installs
+-- already have this. Idempotent, safe to re-run.
+-- ============================================
+
+-- array_to_string is only STABLE, which generated columns reject.
+create or replace function text_array_to_string(arr text[])
+returns text
+language sql
+immutable
+parallel safe
+as $$ select coalesce(array_to_string(arr, ' '), '') $$;
+
+-- Weighted name > paper title/stack > pitch > core (rewrites the table once).
+alter table ideas add column if not exists search_vector tsvector generated always as (
+  setweight(to_tsvector('english', startup_name), 'A')
+  || setweight(to_tsvector('english', paper_title), 'B')
+  || setweight(to_tsvector('english', text_array_to_string(tech_stack)), 'B')
+  || setweight(to_tsvector('english', value_proposition), 'C')
+  || setweight(to_tsvector('english', technical_core), 'D')
+) stored;
+
+create index if not exists idx_ideas_search on ideas using gin(search_vector);
+
+create or replace function search_ideas(query text, max_results int default 20, skip int default 0)
+returns table (
+  id uuid,
+  batch_date text,
+  category idea_category,
+  startup_name text,
+  value_proposition text,
+  why_this_paper text,
+  tech_stack text[],
+  paper_title text,
+  paper_url text,
+  paper_arxiv_id text,
+  paper_primary_category text,
+  created_at timestamptz,
+  rank real,
+  headline text
+)
+language sql
+stable
+as $$
+  with q as (
+    select websearch_to_tsquery('english', search_ideas.query) as tsq
+  ),
+  hits as (
+    select i.*, ts_rank_cd(i.search_vector, q.tsq) as rank, q.tsq
+    from ideas i, q
+    where i.search_vector @@ q.tsq
+    order by rank desc, i.created_at desc, i.id desc
+    limit search_ideas.max_results
+    offset search_ideas.skip
+  )
+  select
+    h.id, h.batch_date, h.category, h.startup_name, h.value_proposition,
+    h.why_this_paper, h.tech_stack, h.paper_title, h.paper_url,
+    h.paper_arxiv_id, h.paper_primary_category, h.created_at, h.rank,
+    ts_headline(
+      'english',
+      h.value_proposition || ' ' || h.technical_core,
+      h.tsq,
+      'StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=12, MaxFragments=2'
+    )
+  from hits h
+  order by h.rank desc, h.created_at desc, h.id desc;
+$$;
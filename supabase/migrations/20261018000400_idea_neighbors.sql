@@ -0,0 +1,48 @@
+-- ============================================
+-- Migration: precomputed similar ideas
+-- For databases created from an older schema.sql; fresh installs
+-- already have this. Idempotent, safe to re-run.
+-- ============================================
+
+create table if not exists idea_neighbors (
+  idea_id     uuid not null references ideas(id) on delete cascade,
+  rank        smallint not null,
+  neighbor_id uuid not null references ideas(id) on delete cascade,
+  similarity  real not null,
+  primary key (idea_id, rank)
+);
+
+comment on table idea_neighbors is 'Nearest-neighbour ideas by TF-IDF similarity of idea + paper text';
+
+-- Cascade deletes look rows up by neighbor_id (idea_id is the PK prefix).
+create index if not exists idx_idea_neighbors_neighbor on idea_neighbors(neighbor_id);
+
+alter table idea_neighbors enable row level security;
+
+drop policy if exists "Public read idea_neighbors" on idea_neighbors;
+create policy "Public read idea_neighbors"
+  on idea_neighbors for select
+  using (true);
+
+create or replace function replace_idea_neighbors(idea_ids uuid[], neighbors jsonb)
+returns int
+language plpgsql
+as $$
+declare
+  inserted int;
+begin
+  delete from idea_neighbors where idea_id = any(replace_idea_neighbors.idea_ids);
+
+  insert into idea_neighbors (idea_id, rank, neighbor_id, similarity)
+  select n.idea_id, n.rank, n.neighbor_id, n.similarity
+  from jsonb_populate_recordset(null::idea_neighbors, coalesce(replace_idea_neighbors.neighbors, '[]'::jsonb)) n
+  where exists (select 1 from ideas i where i.id = n.idea_id)
+    and exists (select 1 from ideas i where i.id = n.neighbor_id);
+  get diagnostics inserted = row_count;
+
+  return inserted;
+end;
+$$;
+
+revoke execute on function replace_idea_neighbors(uuid[], jsonb) from public, anon, authenticated;
+grant execute on function replace_idea_neighbors(uuid[], jsonb) to service_role;
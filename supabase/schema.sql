@@ -33,6 +33,18 @@ create table batches (
 
 comment on table batches is 'Daily batch of arXiv-derived startup blueprints';
 
+-- ============================================
+-- FUNCTION: text_array_to_string
+-- array_to_string is only STABLE, which generated columns reject;
+-- joining text with a space is safe to mark IMMUTABLE.
+-- ============================================
+create or replace function text_array_to_string(arr text[])
+returns text
+language sql
+immutable
+parallel safe
+as $$ select coalesce(array_to_string(arr, ' '), '') $$;
+
 -- ============================================
 -- TABLE: ideas
 -- ============================================
@@ -53,6 +65,9 @@ create table ideas (
   score_pricing_power     int not null default 0 check (score_pricing_power between 0 and 10),
   score_distribution_ease int not null default 0 check (score_distribution_ease between 0 and 10),
   score_speed_to_mvp      int not null default 0 check (score_speed_to_mvp between 0 and 10),
+  score_total             int generated always as (
+    score_demand_urgency + score_pricing_power + score_distribution_ease + score_speed_to_mvp
+  ) stored,
 
   -- Source paper (embedded as columns, not a separate table)
   paper_title           text    not null,
@@ -63,18 +78,48 @@ create table ideas (
   paper_published_at    date,
   paper_primary_category text,
 
-  created_at  timestamptz not null default now()
+  created_at  timestamptz not null default now(),
+
+  -- Full-text search document, weighted name > paper title/stack > pitch > core
+  search_vector tsvector generated always as (
+    setweight(to_tsvector('english', startup_name), 'A')
+    || setweight(to_tsvector('english', paper_title), 'B')
+    || setweight(to_tsvector('english', text_array_to_string(tech_stack)), 'B')
+    || setweight(to_tsvector('english', value_proposition), 'C')
+    || setweight(to_tsvector('english', technical_core), 'D')
+  ) stored
 );
 
 comment on table ideas is 'Individual startup blueprint derived from an arXiv paper';
 
+-- ============================================
+-- TABLE: idea_neighbors
+-- Precomputed "similar ideas" (top 10 from other batches per idea),
+-- maintained incrementally by automation/similar.py.
+-- ============================================
+create table idea_neighbors (
+  idea_id     uuid not null references ideas(id) on delete cascade,
+  rank        smallint not null,
+  neighbor_id uuid not null references ideas(id) on delete cascade,
+  similarity  real not null,
+  primary key (idea_id, rank)
+);
+
+comment on table idea_neighbors is 'Nearest-neighbour ideas by TF-IDF similarity of idea + paper text';
+
 -- ============================================
 -- INDEXES
 -- ============================================
 create index idx_ideas_batch_date on ideas(batch_date);
 create index idx_ideas_category   on ideas(category);
-create index idx_ideas_created_at on ideas(created_at desc);
+-- Keyset pagination for GET /api/ideas: (created_at, id) newest-first,
+-- optionally within one category.
+create index idx_ideas_created_id          on ideas(created_at desc, id desc);
+create index idx_ideas_category_created_id on ideas(category, created_at desc, id desc);
 create index idx_batches_date     on batches(date desc);
+create index idx_ideas_search     on ideas using gin(search_vector);
+-- Cascade deletes look rows up by neighbor_id (idea_id is the PK prefix).
+create index idx_idea_neighbors_neighbor on idea_neighbors(neighbor_id);
 
 -- ============================================
 -- VIEW: batch_with_counts (auto-compute counts)
@@ -98,11 +143,155 @@ left join lateral (
   where ideas.batch_date = b.id
 ) c on true;
 
+-- ============================================
+-- FUNCTION: replace_batch (atomic batch write)
+-- Replaces a batch and all of its ideas in one transaction, so the
+-- pipeline needs a single RPC and a failure never leaves a batch
+-- without its ideas. Missing optional fields fall back to the column
+-- defaults above.
+-- ============================================
+create or replace function replace_batch(batch jsonb, ideas jsonb)
+returns jsonb
+language plpgsql
+as $$
+declare
+  batch_id text := replace_batch.batch->>'id';
+  inserted int;
+begin
+  if batch_id is null then
+    raise exception 'replace_batch: batch.id is required';
+  end if;
+
+  -- ideas go with the batch via on delete cascade
+  delete from batches where id = batch_id;
+
+  insert into batches (
+    id, date, sources, research_themes,
+    counts_backlog, counts_considerable, counts_promising, counts_lucrative
+  )
+  select
+    batch_id,
+    coalesce(b.date, batch_id::date),
+    coalesce(b.sources, '{"cs.LG","cs.MA"}'),
+    b.research_themes,
+    coalesce(b.counts_backlog, 0),
+    coalesce(b.counts_considerable, 0),
+    coalesce(b.counts_promising, 0),
+    coalesce(b.counts_lucrative, 0)
+  from jsonb_populate_record(null::batches, replace_batch.batch) b;
+
+  insert into ideas (
+    id, batch_date, category, startup_name, value_proposition, technical_core,
+    implementation, tech_stack, resume_bullets, why_this_paper,
+    score_demand_urgency, score_pricing_power, score_distribution_ease, score_speed_to_mvp,
+    paper_title, paper_url, paper_authors, paper_abstract, paper_arxiv_id,
+    paper_published_at, paper_primary_category
+  )
+  select
+    coalesce(i.id, gen_random_uuid()), batch_id, i.category, i.startup_name,
+    i.value_proposition, i.technical_core, i.implementation, i.tech_stack,
+    i.resume_bullets, i.why_this_paper,
+    coalesce(i.score_demand_urgency, 0), coalesce(i.score_pricing_power, 0),
+    coalesce(i.score_distribution_ease, 0), coalesce(i.score_speed_to_mvp, 0),
+    i.paper_title, i.paper_url, i.paper_authors, i.paper_abstract, i.paper_arxiv_id,
+    i.paper_published_at, i.paper_primary_category
+  from jsonb_populate_recordset(null::ideas, coalesce(replace_batch.ideas, '[]'::jsonb)) i;
+  get diagnostics inserted = row_count;
+
+  return jsonb_build_object('batch', batch_id, 'ideas', inserted);
+end;
+$$;
+
+-- Writes are for the pipeline only (service role).
+revoke execute on function replace_batch(jsonb, jsonb) from public, anon, authenticated;
+grant execute on function replace_batch(jsonb, jsonb) to service_role;
+
+-- ============================================
+-- FUNCTION: replace_idea_neighbors
+-- Replaces the neighbour lists of idea_ids in one transaction. Rows that
+-- point at ideas no longer in the table (stale pipeline state) are
+-- skipped rather than failing the whole call.
+-- ============================================
+create or replace function replace_idea_neighbors(idea_ids uuid[], neighbors jsonb)
+returns int
+language plpgsql
+as $$
+declare
+  inserted int;
+begin
+  delete from idea_neighbors where idea_id = any(replace_idea_neighbors.idea_ids);
+
+  insert into idea_neighbors (idea_id, rank, neighbor_id, similarity)
+  select n.idea_id, n.rank, n.neighbor_id, n.similarity
+  from jsonb_populate_recordset(null::idea_neighbors, coalesce(replace_idea_neighbors.neighbors, '[]'::jsonb)) n
+  where exists (select 1 from ideas i where i.id = n.idea_id)
+    and exists (select 1 from ideas i where i.id = n.neighbor_id);
+  get diagnostics inserted = row_count;
+
+  return inserted;
+end;
+$$;
+
+revoke execute on function replace_idea_neighbors(uuid[], jsonb) from public, anon, authenticated;
+grant execute on function replace_idea_neighbors(uuid[], jsonb) to service_role;
+
+-- ============================================
+-- FUNCTION: search_ideas (ranked full-text search)
+-- Matches through idx_ideas_search, ranks, pages, and only then builds
+-- highlighted snippets: ts_headline re-parses the text, so it runs on
+-- one page of rows rather than every match.
+-- ============================================
+create or replace function search_ideas(query text, max_results int default 20, skip int default 0)
+returns table (
+  id uuid,
+  batch_date text,
+  category idea_category,
+  startup_name text,
+  value_proposition text,
+  why_this_paper text,
+  tech_stack text[],
+  paper_title text,
+  paper_url text,
+  paper_arxiv_id text,
+  paper_primary_category text,
+  created_at timestamptz,
+  rank real,
+  headline text
+)
+language sql
+stable
+as $$
+  with q as (
+    select websearch_to_tsquery('english', search_ideas.query) as tsq
+  ),
+  hits as (
+    select i.*, ts_rank_cd(i.search_vector, q.tsq) as rank, q.tsq
+    from ideas i, q
+    where i.search_vector @@ q.tsq
+    order by rank desc, i.created_at desc, i.id desc
+    limit search_ideas.max_results
+    offset search_ideas.skip
+  )
+  select
+    h.id, h.batch_date, h.category, h.startup_name, h.value_proposition,
+    h.why_this_paper, h.tech_stack, h.paper_title, h.paper_url,
+    h.paper_arxiv_id, h.paper_primary_category, h.created_at, h.rank,
+    ts_headline(
+      'english',
+      h.value_proposition || ' ' || h.technical_core,
+      h.tsq,
+      'StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=12, MaxFragments=2'
+    )
+  from hits h
+  order by h.rank desc, h.created_at desc, h.id desc;
+$$;
+
 -- ============================================
 -- RLS (Row Level Security) — public read-only
 -- ============================================
 alter table batches enable row level security;
 alter table ideas   enable row level security;
+alter table idea_neighbors enable row level security;
 
 create policy "Public read batches"
   on batches for select
@@ -112,5 +301,9 @@ create policy "Public read ideas"
   on ideas for select
   using (true);
 
+create policy "Public read idea_neighbors"
+  on idea_neighbors for select
+  using (true);
+
 -- Service role key bypasses RLS, so the backend
 -- pipeline can INSERT/UPDATE freely.
@@ -0,0 +1,75 @@
+"""Batch generation: invalid ideas are dropped and the missing slots refilled."""
+
+import asyncio
+import json
+
+from automation import llm_pipeline
+from automation.ingest_arxiv import ArxivPaper
+
+PAPERS = [
+    ArxivPaper(f"Paper {i}", f"https://arxiv.org/abs/2610.{i:05d}", ["A"], "Abstract.", f"2610.{i:05d}", "2026-10-17", "cs.LG")
+    for i in range(12)
+]
+
+
+def _idea(i: int) -> dict:
+    return {
+        "startupName": f"Startup {i}",
+        "valueProposition": "One. Two.",
+        "whyThisPaper": "Because.",
+        "technicalCore": "Core.",
+        "implementation": "Build it.",
+        "techStack": ["python"],
+        "resumeBullets": ["a", "b", "c"],
+        "scores": {"demand_urgency": 5, "pricing_power": 5, "distribution_ease": 5, "speed_to_mvp": 5},
+        "paper": {"title": PAPERS[i].title, "url": PAPERS[i].url},
+    }
+
+
+class FakeClient:
+    """Replays scripted completions in order, whatever the model."""
+
+    total_timeout = 10.0
+
+    def __init__(self, replies: list[dict]):
+        self.replies = [json.dumps(r) for r in replies]
+        self.calls = 0
+
+    async def acomplete(self, payload: dict) -> dict:
+        self.calls += 1
+        content = self.replies.pop(0) if self.replies else "not json"
+        return {"choices": [{"message": {"content": content}}]}
+
+
+def _generate(client: FakeClient) -> dict | None:
+    return asyncio.run(llm_pipeline._generate_batch(client, PAPERS, cache=None, hedge_delay=None))
+
+
+def test_short_fill_response_is_topped_up_by_another_round():
+    batch = {"researchThemes": ["x", "y", "z"], "ideas": [_idea(i) for i in range(5)] + [{"startupName": 1}]}
+    client = FakeClient([
+        batch,
+        {"ideas": [_idea(5), _idea(6)]},  # asked for 3, got 2
+        {"ideas": [_idea(7)]},
+    ])
+
+    data = _generate(client)
+
+    assert data is not None
+    assert [idea["startupName"] for idea in data["ideas"]] == [f"Startup {i}" for i in range(8)]
+    assert client.calls == 3
+
+
+def test_fill_never_reuses_a_paper_across_rounds():
+    batch = {"researchThemes": ["x", "y", "z"], "ideas": [_idea(i) for i in range(6)]}
+    client = FakeClient([
+        batch,
+        {"ideas": [_idea(6)]},
+        {"ideas": [_idea(6), _idea(7)]},  # paper 6 is already used
+    ])
+
+    data = _generate(client)
+
+    assert data is not None
+    assert len(data["ideas"]) == 8
+    assert len({idea["paper"]["url"] for idea in data["ideas"]}) == 8